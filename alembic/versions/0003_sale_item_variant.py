@@ -0,0 +1,35 @@
+"""sale item variant
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 19:15:39.631857
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # batch_alter_table: en SQLite la FK se agrega recreando la tabla; en Postgres es un ALTER comun.
+    with op.batch_alter_table('sale_items') as batch_op:
+        batch_op.add_column(sa.Column('variant_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_sale_items_variant_id'), ['variant_id'], unique=False)
+        batch_op.create_foreign_key('fk_sale_items_variant_id', 'product_variants', ['variant_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('sale_items') as batch_op:
+        batch_op.drop_constraint('fk_sale_items_variant_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_sale_items_variant_id'))
+        batch_op.drop_column('variant_id')
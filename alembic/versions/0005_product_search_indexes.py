@@ -0,0 +1,52 @@
+"""product search indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 19:40:12.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Solo Postgres: en SQLite la busqueda usa el indice en memoria (app/crud/catalog_search.py).
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # La expresion tiene que coincidir con TSVECTOR_SQL para que el planner use el indice.
+    op.create_index(
+        'ix_products_search_tsv',
+        'products',
+        [sa.text("to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))")],
+        postgresql_using='gin',
+    )
+    op.create_index(
+        'ix_products_name_trgm',
+        'products',
+        ['name'],
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index('ix_product_variants_size', 'product_variants', ['size'], unique=False)
+    op.create_index('ix_product_variants_color', 'product_variants', ['color'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_product_variants_color', table_name='product_variants')
+    op.drop_index('ix_product_variants_size', table_name='product_variants')
+    op.drop_index('ix_products_name_trgm', table_name='products')
+    op.drop_index('ix_products_search_tsv', table_name='products')
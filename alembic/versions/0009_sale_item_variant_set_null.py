@@ -0,0 +1,35 @@
+"""sale item variant set null
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 20:05:12.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Al borrar una variante ya vendida, las lineas de venta conservan el producto y quedan sin variante.
+    # batch_alter_table recrea la tabla en SQLite, que no permite cambiar constraints con ALTER.
+    with op.batch_alter_table('sale_items') as batch_op:
+        batch_op.drop_constraint('fk_sale_items_variant_id', type_='foreignkey')
+        batch_op.create_foreign_key(
+            'fk_sale_items_variant_id', 'product_variants', ['variant_id'], ['id'], ondelete='SET NULL'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('sale_items') as batch_op:
+        batch_op.drop_constraint('fk_sale_items_variant_id', type_='foreignkey')
+        batch_op.create_foreign_key('fk_sale_items_variant_id', 'product_variants', ['variant_id'], ['id'])
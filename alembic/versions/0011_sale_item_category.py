@@ -0,0 +1,41 @@
+"""sale item category
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 20:01:12.105732
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sale_items', sa.Column('category_id', sa.Integer(), nullable=True))
+    # Las ventas existentes toman la categoria actual del producto (la original no quedo guardada).
+    op.execute(
+        """
+        UPDATE sale_items SET category_id = (
+            SELECT p.category_id FROM products p WHERE p.id = sale_items.product_id
+        )
+        """
+    )
+    with op.batch_alter_table('sale_items') as batch_op:
+        batch_op.alter_column('category_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_sale_items_category_id', 'categories', ['category_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('sale_items') as batch_op:
+        batch_op.drop_constraint('fk_sale_items_category_id', type_='foreignkey')
+        batch_op.drop_column('category_id')
@@ -0,0 +1,128 @@
+"""
+Comandos de mantenimiento. Uso:
+
+    python -m app.cli check-sale-totals [--fix]
+    python -m app.cli import-catalog archivo.csv|archivo.ndjson [--format csv|ndjson] [--chunk-size N]
+    python -m app.cli refresh-analytics [--from AAAA-MM-DD] [--to AAAA-MM-DD]
+    python -m app.cli check-product-summaries [--fix]
+    python -m app.cli purge-idempotency-keys [--hours N]
+"""
+import argparse
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.crud import analytics, catalog, catalog_import
+from app.crud import sale as sale_crud
+
+
+def check_sale_totals(args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        mismatches = sale_crud.find_sale_total_mismatches(db, limit=args.limit)
+        for sale_id, stored, computed in mismatches:
+            print(f"sale {sale_id}: total_amount={stored} items={computed}")
+        print(f"{len(mismatches)} sale(s) with inconsistent totals.")
+        if args.fix and mismatches:
+            repaired = sale_crud.repair_sale_totals(db, [sale_id for sale_id, _, _ in mismatches])
+            print(f"{repaired} sale(s) repaired.")
+        return 1 if mismatches and not args.fix else 0
+    finally:
+        db.close()
+
+
+def import_catalog(args: argparse.Namespace) -> int:
+    file_format = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            report = catalog_import.import_catalog(
+                db,
+                catalog_import.iter_import_records(stream, file_format),
+                chunk_size=args.chunk_size,
+            )
+    finally:
+        db.close()
+    print(report.model_dump_json(indent=2))
+    return 1 if report.errors else 0
+
+
+def refresh_analytics(args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        days = analytics.rebuild_rollups(db, date_from=args.date_from, date_to=args.date_to)
+    finally:
+        db.close()
+    print(f"{days} day(s) of sales analytics rebuilt.")
+    return 0
+
+
+def check_product_summaries(args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        product_ids = catalog.find_product_summary_mismatches(db, limit=args.limit)
+        for product_id in product_ids:
+            print(f"product {product_id}: summary columns out of date")
+        print(f"{len(product_ids)} product(s) with stale summary columns.")
+        if args.fix and product_ids:
+            repaired = catalog.repair_product_summaries(db, product_ids)
+            print(f"{repaired} product(s) repaired.")
+        return 1 if product_ids and not args.fix else 0
+    finally:
+        db.close()
+
+
+def purge_idempotency_keys(args: argparse.Namespace) -> int:
+    older_than = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=args.hours)
+    db = SessionLocal()
+    try:
+        purged = sale_crud.purge_idempotency_keys(db, older_than)
+    finally:
+        db.close()
+    print(f"{purged} idempotency key(s) older than {args.hours}h purged.")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check = commands.add_parser("check-sale-totals", help="Compare Sale.total_amount with the sum of its items.")
+    check.add_argument("--fix", action="store_true", help="Rewrite inconsistent totals from the item sums.")
+    check.add_argument("--limit", type=int, default=None, help="Report at most this many sales.")
+    check.set_defaults(handler=check_sale_totals)
+
+    importer = commands.add_parser("import-catalog", help="Upsert products, variants and images from CSV/NDJSON.")
+    importer.add_argument("path")
+    importer.add_argument("--format", choices=catalog_import.IMPORT_FORMATS, default=None)
+    importer.add_argument("--chunk-size", type=int, default=None)
+    importer.set_defaults(handler=import_catalog)
+
+    refresh = commands.add_parser("refresh-analytics", help="Rebuild the daily sales rollups from the sales tables.")
+    refresh.add_argument("--from", dest="date_from", type=date.fromisoformat, default=None)
+    refresh.add_argument("--to", dest="date_to", type=date.fromisoformat, default=None)
+    refresh.set_defaults(handler=refresh_analytics)
+
+    summaries = commands.add_parser(
+        "check-product-summaries",
+        help="Compare the denormalized price/stock/image columns of products with their variants.",
+    )
+    summaries.add_argument("--fix", action="store_true", help="Recompute the stale rows.")
+    summaries.add_argument("--limit", type=int, default=None, help="Report at most this many products.")
+    summaries.set_defaults(handler=check_product_summaries)
+
+    purge = commands.add_parser("purge-idempotency-keys", help="Delete POST /sales Idempotency-Key rows past their TTL.")
+    purge.add_argument("--hours", type=int, default=settings.SALES_IDEMPOTENCY_TTL_HOURS)
+    purge.set_defaults(handler=purge_idempotency_keys)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
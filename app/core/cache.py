@@ -0,0 +1,179 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from app.core.config import settings
+
+
+class CacheBackend(Protocol):
+    """Interfaz minima que debe cumplir un backend de cache (memoria, Redis, etc.)."""
+
+    def get(self, key: str) -> Any | None: ...
+
+    def set(self, key: str, value: Any, *, ttl: float | None = None, tags: Iterable[str] = ()) -> None: ...
+
+    def delete(self, *keys: str) -> None: ...
+
+    def invalidate_tags(self, *tags: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict[str, int]: ...
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float | None
+    tags: tuple[str, ...]
+
+
+class InMemoryCache:
+    """Cache LRU en memoria del proceso, con TTL por entrada e invalidacion por tags."""
+
+    def __init__(self, max_entries: int = 1024, default_ttl: float | None = None) -> None:
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, *, ttl: float | None = None, tags: Iterable[str] = ()) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            entry = _Entry(value=value, expires_at=expires_at, tags=tuple(tags))
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def invalidate_tags(self, *tags: str) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+    # Cuerpo ya comprimido por Content-Encoding ("gzip", "br"), calculado antes de guardar la entrada.
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+
+PRODUCT_LIST_TAG = "catalog:products"
+# Listados con filtros u orden distinto de id: cualquier cambio de un producto puede moverlos.
+PRODUCT_QUERY_LIST_TAG = "catalog:products:query"
+
+
+def product_tag(product_id: int) -> str:
+    return f"catalog:product:{product_id}"
+
+
+catalog_cache: CacheBackend = InMemoryCache(
+    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+    default_ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+)
+
+
+def configure_catalog_cache(backend: CacheBackend) -> None:
+    """Reemplaza el backend del cache del catalogo (por ejemplo, por uno sobre Redis)."""
+    global catalog_cache
+    catalog_cache = backend
+
+
+def get_catalog_cache() -> CacheBackend:
+    return catalog_cache
+
+
+def invalidate_product(product_id: int, *, lists: bool = False, query_lists: bool = True) -> None:
+    """
+    Invalida las entradas del producto y las paginas de listado que lo contienen. query_lists=False
+    deja los listados con filtros u orden: sirve cuando el cambio no puede meter ni sacar el producto
+    de una pagina donde no esta (por ejemplo, una venta que no deja ninguna variante sin stock).
+    """
+    tags = [product_tag(product_id)]
+    if query_lists:
+        tags.append(PRODUCT_QUERY_LIST_TAG)
+    if lists:
+        tags.append(PRODUCT_LIST_TAG)
+    catalog_cache.invalidate_tags(*tags)
+
+
+principal_cache: CacheBackend = InMemoryCache(
+    max_entries=settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+    default_ttl=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def user_tag(user_id: int) -> str:
+    return f"auth:user:{user_id}"
+
+
+def invalidate_user(user_id: int) -> None:
+    """Descarta los usuarios autenticados cacheados para user_id (cualquier token)."""
+    principal_cache.invalidate_tags(user_tag(user_id))
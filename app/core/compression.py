@@ -0,0 +1,164 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.etag import encoded_etag
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional; sin el solo se negocia gzip.
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def available_encodings() -> tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Elige la codificacion segun Accept-Encoding (prefiere br sobre gzip, respeta q=0)."""
+    if not accept_encoding:
+        return None
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def is_compressible(content_type: str | None) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith("text/") or media_type.endswith("+json") or media_type in COMPRESSIBLE_TYPES
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str) -> None:
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, *, final: bool) -> bytes:
+        if self._brotli is not None:
+            chunk = self._brotli.process(data)
+            return chunk + (self._brotli.finish() if final else self._brotli.flush())
+        chunk = self._zlib.compress(data)
+        return chunk + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    return _StreamCompressor(encoding).compress(body, final=True)
+
+
+def _add_vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary")
+    if not vary:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+class CompressionMiddleware:
+    """
+    Comprime con br/gzip las respuestas de texto/JSON a partir de minimum_size bytes.
+    Las respuestas que ya traen Content-Encoding (por ejemplo, las precomprimidas del cache
+    del catalogo) pasan sin tocar; las respuestas en streaming se comprimen por chunk.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.minimum_size))
+
+
+class _CompressingSend:
+    def __init__(self, send: Send, encoding: str, minimum_size: int) -> None:
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Message | None = None
+        self.compressor: _StreamCompressor | None = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is not None:
+            await self.send(
+                {
+                    "type": "http.response.body",
+                    "body": self.compressor.compress(body, final=not more_body),
+                    "more_body": more_body,
+                }
+            )
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        if (
+            "content-encoding" in headers
+            or self.start["status"] in (204, 304)
+            or not is_compressible(headers.get("content-type"))
+            or (not more_body and len(body) < self.minimum_size)
+        ):
+            self.passthrough = True
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        self.compressor = _StreamCompressor(self.encoding)
+        payload = self.compressor.compress(body, final=not more_body)
+        headers["Content-Encoding"] = self.encoding
+        _add_vary(headers)
+        if "etag" in headers:
+            headers["ETag"] = encoded_etag(headers["etag"], self.encoding)
+        if more_body:
+            del headers["content-length"]
+        else:
+            headers["Content-Length"] = str(len(payload))
+        await self._flush_start()
+        await self.send({"type": "http.response.body", "body": payload, "more_body": more_body})
+
+    async def _flush_start(self) -> None:
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self.send(start)
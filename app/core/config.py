@@ -6,6 +6,65 @@ class Settings(BaseSettings):
     SECRET_KEY: str = Field(validation_alias=AliasChoices("SECRET_KEY", "JWT_SECRET_KEY"))
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    BCRYPT_ROUNDS: int = 12
+    # "process" (por defecto), "thread" o "inline" (sin executor, en el hilo del request).
+    PASSWORD_HASHER_EXECUTOR: str = "process"
+    PASSWORD_HASHER_WORKERS: int = 2
+    PASSWORD_HASHER_MAX_PENDING: int = 64
+    PASSWORD_HASHER_RETRY_AFTER_SECONDS: int = 1
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int | None = None
+
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+
+    CATALOG_CACHE_ENABLED: bool = True
+    CATALOG_CACHE_TTL_SECONDS: int = 60
+    CATALOG_CACHE_MAX_ENTRIES: int = 1024
+
+    CATALOG_IMPORT_CHUNK_SIZE: int = 500
+    CATALOG_IMPORT_MAX_ERRORS: int = 1000
+
+    # Activa los headers X-DB-* de diagnostico en las respuestas.
+    DEBUG: bool = False
+
+    HTTP_METRICS_ENABLED: bool = True
+    # Token Bearer que tiene que mandar el scraper de /metrics; sin token, /metrics es solo para admins.
+    METRICS_TOKEN: str | None = None
+    HEALTH_READY_CACHE_SECONDS: float = 5
+
+    SQL_STATS_ENABLED: bool = True
+    SQL_SERVER_TIMING_ENABLED: bool = True
+    # Una misma sentencia normalizada repetida mas de N veces en un request se reporta como N+1.
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
+
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    SKU_INDEX_ENABLED: bool = True
+    # Vencimiento de las entradas del indice de stock por SKU. 0 = sin vencimiento: las escrituras
+    # de la app ya lo actualizan. Activarlo solo si otro proceso o worker escribe el stock.
+    SKU_INDEX_TTL_SECONDS: float = 0
+
+    # "auto" usa tsvector/trigramas en Postgres y el indice en memoria en el resto.
+    CATALOG_SEARCH_BACKEND: str = "auto"
+
+    # Las Idempotency-Key de POST /sales se conservan al menos este tiempo (ver purge-idempotency-keys).
+    SALES_IDEMPOTENCY_TTL_HOURS: int = 24
+
+    AUTH_PRINCIPAL_CACHE_ENABLED: bool = True
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    # Si esta activo, los endpoints de solo lectura confian en los claims sub/role del JWT sin consultar la base.
+    AUTH_STATELESS_READS: bool = False
+
     class Config:
         env_file = ".env"
 
@@ -1,16 +1,163 @@
+import time
+from collections.abc import Callable
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
-import os 
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, Histogram
+from app.core.sql_stats import instrument_engine
+
+DATABASE_URL = settings.DATABASE_URL
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool.",
+    labelnames=("engine",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0),
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Pool checkouts that gave up after DB_POOL_TIMEOUT.",
+    labelnames=("engine",),
+)
+POOL_SIZE = Gauge("db_pool_size", "Configured pool size.", labelnames=("engine",))
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently checked out.", labelnames=("engine",))
+POOL_CHECKED_IN = Gauge("db_pool_checked_in", "Idle connections held by the pool.", labelnames=("engine",))
+POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections opened beyond the pool size.", labelnames=("engine",))
+
+
+class _TimedCheckoutMixin:
+    metrics_label = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc(engine=self.metrics_label)
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, engine=self.metrics_label)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    metrics_label = "sync"
 
-DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def _engine_options(database_url: str, poolclass) -> dict:
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return {}
+
+    options = {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.get_backend_name() == "postgresql":
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL, InstrumentedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(database_url: str) -> str:
+    """Devuelve la URL equivalente con un driver async (asyncpg / aiosqlite)."""
+    url = make_url(database_url)
+    url = url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+    if url.drivername == "postgresql+asyncpg" and "sslmode" in url.query:
+        query = dict(url.query)
+        query["ssl"] = query.pop("sslmode")
+        url = url.set(query=query)
+    return url.render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+
+async_engine = (
+    create_async_engine(ASYNC_DATABASE_URL, **_engine_options(ASYNC_DATABASE_URL, InstrumentedAsyncQueuePool))
+    if settings.ASYNC_DB_ENABLED
+    else None
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+instrument_engine(engine)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+
+
+def _pool_gauge(read: Callable[[QueuePool], float]) -> Callable[[], dict[tuple[str, ...], float]]:
+    def collect() -> dict[tuple[str, ...], float]:
+        values = {}
+        for label, bound_engine in (("sync", engine), ("async", async_engine and async_engine.sync_engine)):
+            pool = getattr(bound_engine, "pool", None)
+            if isinstance(pool, QueuePool):
+                values[(label,)] = read(pool)
+        return values
+
+    return collect
+
+
+POOL_SIZE.set_function(_pool_gauge(lambda pool: pool.size()))
+POOL_CHECKED_OUT.set_function(_pool_gauge(lambda pool: pool.checkedout()))
+POOL_CHECKED_IN.set_function(_pool_gauge(lambda pool: pool.checkedin()))
+POOL_OVERFLOW.set_function(_pool_gauge(lambda pool: max(pool.overflow(), 0)))
+
+
+def upsert_insert(db):
+    """Devuelve el insert del dialecto (con on_conflict_do_update/do_nothing)."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f"Upserts are not supported on the {dialect} dialect.")
+    return insert
+
+
+def commit_loaded(db) -> None:
+    """Commit sin expirar la sesion: los objetos escritos se devuelven sin volver a leerlos."""
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,18 +1,42 @@
+import hashlib
+import hmac
+import time
+from dataclasses import dataclass
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.db import get_db
+from app.core.cache import principal_cache, user_tag
+from app.core.db import get_async_db, get_db
 from app.core.config import settings
 from app.core.security import decode_token
+from app.crud import async_user
 from app.crud.user import get_user_by_id
 
 security = HTTPBearer()
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-):
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Datos del usuario autenticado, desacoplados de la sesion de SQLAlchemy para poder cachearlos."""
+
+    id: int
+    role: str | None
+    username: str | None = None
+    email: str | None = None
+
+
+@dataclass(frozen=True)
+class _TokenClaims:
+    user_id: int
+    role: str | None
+    expires_at: float | None
+    cache_key: str
+
+
+def _decode_credentials(credentials: HTTPAuthorizationCredentials) -> _TokenClaims:
     token = credentials.credentials
 
     try:
@@ -27,17 +51,103 @@ def get_current_user(
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
 
-    user = get_user_by_id(db, int(user_id))
+    token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    return _TokenClaims(
+        user_id=int(user_id),
+        role=payload.get("role"),
+        expires_at=payload.get("exp"),
+        cache_key=f"auth:principal:{user_id}:{token_hash}",
+    )
+
+
+def _cached_user(claims: _TokenClaims) -> CurrentUser | None:
+    if not settings.AUTH_PRINCIPAL_CACHE_ENABLED:
+        return None
+    return principal_cache.get(claims.cache_key)
+
+
+def _resolve_user(user, claims: _TokenClaims) -> CurrentUser:
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
-    token_role = payload.get("role")
-    if token_role and not getattr(user, "role", None):
-        setattr(user, "role", token_role)
+    current_user = CurrentUser(
+        id=user.id,
+        role=getattr(user, "role", None) or claims.role,
+        username=user.username,
+        email=user.email,
+    )
+    if settings.AUTH_PRINCIPAL_CACHE_ENABLED:
+        ttl = float(settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS)
+        if claims.expires_at is not None:
+            ttl = min(ttl, claims.expires_at - time.time())
+        if ttl > 0:
+            principal_cache.set(claims.cache_key, current_user, ttl=ttl, tags=[user_tag(user.id)])
+    return current_user
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> CurrentUser:
+    claims = _decode_credentials(credentials)
+    return _cached_user(claims) or _resolve_user(get_user_by_id(db, claims.user_id), claims)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> CurrentUser:
+    claims = _decode_credentials(credentials)
+    return _cached_user(claims) or _resolve_user(await async_user.get_user_by_id(db, claims.user_id), claims)
+
+
+def _stateless_user(claims: _TokenClaims) -> CurrentUser:
+    return CurrentUser(id=claims.user_id, role=claims.role)
+
+
+def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> CurrentUser:
+    """
+    Para endpoints de solo lectura que solo necesitan id y role.
+    Con AUTH_STATELESS_READS confia en los claims del token hasta su expiracion.
+    """
+    if settings.AUTH_STATELESS_READS:
+        return _stateless_user(_decode_credentials(credentials))
+    return get_current_user(credentials, db)
+
+
+async def get_current_principal_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> CurrentUser:
+    if settings.AUTH_STATELESS_READS:
+        return _stateless_user(_decode_credentials(credentials))
+    return await get_current_user_async(credentials, db)
 
-    return user
 
 def require_admin(current_user=Depends(get_current_user)):
     if getattr(current_user, "role", None) != "admin":
         raise HTTPException(status_code=403, detail="Admin only")
     return current_user
+
+
+async def require_admin_async(current_user=Depends(get_current_user_async)):
+    return require_admin(current_user)
+
+
+def require_metrics_access(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> None:
+    """Con METRICS_TOKEN, /metrics acepta ese token como Bearer; si no esta configurado, solo admins."""
+    if settings.METRICS_TOKEN:
+        if not hmac.compare_digest(credentials.credentials.encode(), settings.METRICS_TOKEN.encode()):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return
+    require_admin(get_current_user(credentials, db))
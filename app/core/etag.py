@@ -0,0 +1,63 @@
+import hashlib
+from collections.abc import Iterable
+
+from fastapi import Response, status
+
+
+def product_etag(product_id: int, version: int) -> str:
+    return f'"p{product_id}-v{version}"'
+
+
+def product_list_etag(versions: Iterable[tuple[int, int]], view: str = "full") -> str:
+    """ETag fuerte de una pagina de productos, derivado de los pares (id, version) y la vista."""
+    digest = hashlib.sha1()
+    if view != "full":
+        digest.update(f"{view};".encode("ascii"))
+    for product_id, version in versions:
+        digest.update(f"{product_id}:{version};".encode("ascii"))
+    return f'"l-{digest.hexdigest()}"'
+
+
+# Cada codificacion es una representacion distinta: su ETag fuerte lleva la codificacion ("p1-v5-gzip").
+ENCODED_ETAG_SUFFIXES = ("-gzip", "-br")
+
+
+def encoded_etag(etag: str, encoding: str | None) -> str:
+    if not encoding or encoding == "identity":
+        return etag
+    return f"{etag[:-1]}-{encoding}{etag[-1]}"
+
+
+def _base_etag(candidate: str) -> str:
+    for suffix in ENCODED_ETAG_SUFFIXES:
+        if candidate.endswith(f'{suffix}"'):
+            return f'{candidate[:-len(suffix) - 1]}"'
+    return candidate
+
+
+def matching_etag(if_none_match: str | None, etag: str) -> str | None:
+    """
+    Devuelve el tag de If-None-Match que corresponde a etag (base o con la codificacion),
+    o None si ninguno coincide. La comparacion es debil, como pide If-None-Match: un W/
+    delante (lo agregan proxies que recomprimen) no impide el 304.
+    """
+    if not if_none_match:
+        return None
+    for candidate in (candidate.strip() for candidate in if_none_match.split(",")):
+        if candidate == "*":
+            return etag
+        if _base_etag(candidate.removeprefix("W/")) == etag:
+            return candidate
+    return None
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    return matching_etag(if_none_match, etag) is not None
+
+
+def not_modified(etag: str, if_none_match: str | None = None) -> Response:
+    """304 con el ETag de la representacion que tiene el cliente (la de su If-None-Match)."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": matching_etag(if_none_match, etag) or etag, "Vary": "Accept-Encoding"},
+    )
@@ -0,0 +1,44 @@
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+
+class ReadinessCheck:
+    """
+    Chequea la conexion a la base con un SELECT 1 y cachea el resultado ttl segundos.
+    Un solo hilo consulta a la vez; los probes que llegan mientras tanto esperan y reciben ese resultado.
+    """
+
+    def __init__(self, engine: Engine, ttl_seconds: float) -> None:
+        self.engine = engine
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._result: tuple[bool, str | None] | None = None
+        self._checked_at = 0.0
+
+    def _fresh(self) -> tuple[bool, str | None] | None:
+        if self._result is not None and time.monotonic() - self._checked_at < self.ttl_seconds:
+            return self._result
+        return None
+
+    def check(self) -> tuple[bool, str | None]:
+        result = self._fresh()
+        if result is not None:
+            return result
+        with self._lock:
+            result = self._fresh()
+            if result is None:
+                result = self._result = self._probe()
+                self._checked_at = time.monotonic()
+            return result
+
+    def _probe(self) -> tuple[bool, str | None]:
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except SQLAlchemyError as exc:
+            return False, type(exc).__name__
+        return True, None
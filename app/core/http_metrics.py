@@ -0,0 +1,79 @@
+import time
+
+import anyio.to_thread
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import Counter, Gauge, Histogram
+
+REQUESTS_TOTAL = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status code.",
+    labelnames=("method", "route", "status"),
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, until the last body chunk is sent.",
+    labelnames=("method", "route"),
+)
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+THREADPOOL_TOKENS = Gauge("threadpool_tokens", "Worker threads available to sync routes and dependencies.")
+THREADPOOL_BORROWED = Gauge("threadpool_borrowed_tokens", "Worker threads currently running sync code.")
+THREADPOOL_WAITING = Gauge("threadpool_tasks_waiting", "Tasks queued waiting for a free worker thread.")
+
+_threadpool_limiter = None
+
+
+def route_label(scope: Scope) -> str:
+    """Plantilla de la ruta resuelta (p. ej. /catalog/products/{product_id}), no el path real."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def track_threadpool() -> None:
+    """Toma el limitador del threadpool de anyio; se llama en el startup, dentro del event loop."""
+    global _threadpool_limiter
+    _threadpool_limiter = anyio.to_thread.current_default_thread_limiter()
+
+
+def _threadpool_stat(read):
+    def collect() -> dict[tuple[str, ...], float]:
+        if _threadpool_limiter is None:
+            return {}
+        return {(): read(_threadpool_limiter)}
+
+    return collect
+
+
+THREADPOOL_TOKENS.set_function(_threadpool_stat(lambda limiter: limiter.total_tokens))
+THREADPOOL_BORROWED.set_function(_threadpool_stat(lambda limiter: limiter.borrowed_tokens))
+THREADPOOL_WAITING.set_function(_threadpool_stat(lambda limiter: limiter.statistics().tasks_waiting))
+
+
+class RequestMetricsMiddleware:
+    """Conteo por ruta y status, latencia y requests en curso. Corre en el event loop."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            method, route = scope["method"], route_label(scope)
+            REQUEST_DURATION.observe(time.perf_counter() - start, method=method, route=route)
+            REQUESTS_TOTAL.inc(method=method, route=route, status=str(status_code))
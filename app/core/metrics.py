@@ -0,0 +1,218 @@
+import bisect
+import math
+import threading
+import weakref
+from collections.abc import Callable, Iterable
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Iterable[str], labelvalues: Iterable[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape_label(str(value))}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _ShardHolder:
+    """Guarda el shard en el threading.local; cuando el hilo termina se libera y dispara el finalize."""
+
+    __slots__ = ("values", "__weakref__")
+
+    def __init__(self) -> None:
+        self.values: dict = {}
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), registry=None) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        # Valores acumulados de los hilos que ya terminaron (el threadpool de anyio los recicla).
+        self._retired: dict = {}
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _shard(self) -> dict:
+        """Valores propios del hilo actual: se escriben sin lock y se suman al hacer el scrape."""
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            holder = self._local.holder = _ShardHolder()
+            with self._lock:
+                self._shards.append(holder.values)
+            weakref.finalize(holder, self._retire, holder.values)
+        return holder.values
+
+    def _retire(self, shard: dict) -> None:
+        """Suma el shard de un hilo terminado a _retired y lo saca de la lista."""
+        with self._lock:
+            self._shards = [other for other in self._shards if other is not shard]
+            for key, value in shard.items():
+                self._merge(self._retired, key, value)
+
+    def _merge(self, into: dict, key: tuple[str, ...], value) -> None:
+        raise NotImplementedError
+
+    def _shard_snapshots(self) -> list[dict]:
+        with self._lock:
+            shards = list(self._shards)
+            retired: dict = {}
+            for key, value in self._retired.items():
+                self._merge(retired, key, value)
+        return [retired, *(dict(shard) for shard in shards)]
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if len(labels) == len(self.labelnames):
+            try:
+                return tuple([str(labels[name]) for name in self.labelnames])
+            except KeyError:
+                pass
+        raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}.")
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        shard = self._shard()
+        shard[key] = shard.get(key, 0) + amount
+
+    def _merge(self, into: dict, key: tuple[str, ...], value: float) -> None:
+        into[key] = into.get(key, 0) + value
+
+    def _samples(self) -> list[str]:
+        values: dict[tuple[str, ...], float] = {}
+        for shard in self._shard_snapshots():
+            for key, value in shard.items():
+                self._merge(values, key, value)
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in values.items()]
+
+
+class Gauge(_Metric):
+    """Gauge con valores fijados a mano o calculados al momento del scrape (set_function)."""
+
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._function: Callable[[], float | dict[tuple[str, ...], float]] | None = None
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float | dict[tuple[str, ...], float]]) -> None:
+        self._function = function
+
+    def _samples(self) -> list[str]:
+        if self._function is not None:
+            result = self._function()
+            values = result if isinstance(result, dict) else {(): result}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Iterable[float] = DEFAULT_BUCKETS, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        shard = self._shard()
+        series = shard.get(key)
+        if series is None:
+            # [conteo por bucket..., +Inf, suma]
+            series = shard[key] = [0.0] * (len(self.buckets) + 2)
+        series[index] += 1
+        series[-1] += value
+
+    def _merge(self, into: dict, key: tuple[str, ...], series: list[float]) -> None:
+        total = into.setdefault(key, [0.0] * len(series))
+        for index, count in enumerate(list(series)):
+            total[index] += count
+
+    def _samples(self) -> list[str]:
+        snapshot: dict[tuple[str, ...], list[float]] = {}
+        for shard in self._shard_snapshots():
+            for key, series in shard.items():
+                self._merge(snapshot, key, series)
+        lines = []
+        for key, series in snapshot.items():
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, math.inf), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered.")
+            self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def render_latest() -> str:
+    return REGISTRY.render()
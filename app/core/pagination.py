@@ -0,0 +1,63 @@
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(**values: Any) -> str:
+    """Devuelve un cursor opaco (base64 url-safe) con los valores de la clave de orden."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """
+    Devuelve los valores guardados en el cursor.
+    Si el cursor esta mal formado, lanza ValueError.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError("Invalid cursor.") from e
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor.")
+    return values
+
+
+def cursor_id(cursor: str | None) -> int | None:
+    if cursor is None:
+        return None
+    try:
+        return int(decode_cursor(cursor)["id"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.") from exc
+
+
+def cursor_values(cursor: str | None) -> dict[str, Any] | None:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.") from exc
+
+
+def next_cursor_headers(
+    rows: Sequence[Any],
+    limit: int,
+    values: Callable[[Any], dict[str, Any]] | None = None,
+) -> dict[str, str]:
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        return {NEXT_CURSOR_HEADER: encode_cursor(**(values(last) if values else {"id": last.id}))}
+    return {}
+
+
+def set_next_cursor(response: Response, rows: Sequence[Any], limit: int) -> None:
+    response.headers.update(next_cursor_headers(rows, limit))
@@ -0,0 +1,52 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional; sin el se usa json de la stdlib.
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse con orjson (si esta instalado) y Decimal como string, para rutas que devuelven
+    dicts/listas sin response_model. No usarla como default_response_class: con una clase propia
+    FastAPI deja de serializar los response_model directo con TypeAdapter.dump_json.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def adapter_response(
+    adapter: TypeAdapter,
+    value: Any,
+    *,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Valida (from_attributes) y serializa a bytes en un solo paso con el TypeAdapter del schema."""
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(value, from_attributes=True)),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
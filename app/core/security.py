@@ -1,29 +1,149 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+
 import bcrypt
 from jose import JWTError, jwt
 
+from app.core.config import settings
+from app.core.metrics import Counter, Histogram
+
 ALGORITHM = "HS256"
 MAX_BCRYPT_PASSWORD_BYTES = 72
 
+PASSWORD_VERIFY_SECONDS = Histogram(
+    "password_verify_seconds",
+    "bcrypt verification time by cost factor of the stored hash.",
+    labelnames=("cost",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.4, 0.8, 1.6, 3.2),
+)
+PASSWORD_REHASHES = Counter(
+    "password_rehashes_total",
+    "Stored hashes rewritten to BCRYPT_ROUNDS after a successful login.",
+    labelnames=("from_cost", "to_cost"),
+)
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Se lanza cuando la cola de operaciones bcrypt esta llena."""
+
+
+def _hashpw(password: bytes, rounds: int) -> str:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _checkpw(password: bytes, hashed_password: bytes) -> tuple[bool, float]:
+    start = time.perf_counter()
+    try:
+        matches = bcrypt.checkpw(password, hashed_password)
+    except ValueError:
+        matches = False
+    return matches, time.perf_counter() - start
+
+
+_executor: Executor | None = None
+_pending_slots = threading.BoundedSemaphore(max(settings.PASSWORD_HASHER_MAX_PENDING, 1))
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> Executor | None:
+    global _executor
+    if settings.PASSWORD_HASHER_EXECUTOR == "inline":
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                if settings.PASSWORD_HASHER_EXECUTOR == "thread":
+                    _executor = ThreadPoolExecutor(
+                        max_workers=settings.PASSWORD_HASHER_WORKERS,
+                        thread_name_prefix="password-hasher",
+                    )
+                else:
+                    _executor = ProcessPoolExecutor(
+                        max_workers=settings.PASSWORD_HASHER_WORKERS,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+    return _executor
+
+
+def _submit(fn, *args) -> Future:
+    executor = _get_executor()
+    if executor is None:
+        future: Future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    if not _pending_slots.acquire(blocking=False):
+        raise PasswordHasherBusy("Too many password operations in progress.")
+    try:
+        future = executor.submit(fn, *args)
+    except BaseException:
+        _pending_slots.release()
+        raise
+    future.add_done_callback(lambda _: _pending_slots.release())
+    return future
+
+
+def shutdown_password_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def get_hash_rounds(hashed_password: str) -> int | None:
+    """Devuelve el cost factor guardado en un hash bcrypt ($2b$<cost>$...), o None si no es valido."""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    return get_hash_rounds(hashed_password) != settings.BCRYPT_ROUNDS
+
+
+def record_rehash(old_hash: str) -> None:
+    PASSWORD_REHASHES.inc(from_cost=str(get_hash_rounds(old_hash)), to_cost=str(settings.BCRYPT_ROUNDS))
+
+
+def _observe_verify(hashed_password: str, result: tuple[bool, float]) -> bool:
+    matches, elapsed = result
+    PASSWORD_VERIFY_SECONDS.observe(elapsed, cost=str(get_hash_rounds(hashed_password)))
+    return matches
+
 
 def hash_password(password: str) -> str:
     """Devuelve el hash bcrypt de la contrasena."""
     if len(password.encode("utf-8")) > MAX_BCRYPT_PASSWORD_BYTES:
         raise ValueError("Password cannot be longer than 72 bytes for bcrypt.")
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return _submit(_hashpw, password.encode("utf-8"), settings.BCRYPT_ROUNDS).result()
+
+
+async def hash_password_async(password: str) -> str:
+    if len(password.encode("utf-8")) > MAX_BCRYPT_PASSWORD_BYTES:
+        raise ValueError("Password cannot be longer than 72 bytes for bcrypt.")
+    return await asyncio.wrap_future(_submit(_hashpw, password.encode("utf-8"), settings.BCRYPT_ROUNDS))
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Devuelve True si plain_password coincide con hashed_password."""
     if len(plain_password.encode("utf-8")) > MAX_BCRYPT_PASSWORD_BYTES:
         return False
-    try:
-        return bcrypt.checkpw(
-            plain_password.encode("utf-8"),
-            hashed_password.encode("utf-8"),
-        )
-    except ValueError:
+    future = _submit(_checkpw, plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+    return _observe_verify(hashed_password, future.result())
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Igual que verify_password, pero espera el resultado sin ocupar un hilo del threadpool."""
+    if len(plain_password.encode("utf-8")) > MAX_BCRYPT_PASSWORD_BYTES:
         return False
+    future = _submit(_checkpw, plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+    return _observe_verify(hashed_password, await asyncio.wrap_future(future))
 
 
 def create_access_token(data: dict, secret_key: str, minutes: int) -> str:
@@ -0,0 +1,177 @@
+import logging
+import re
+import time
+from collections import Counter as StatementCounter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.http_metrics import route_label
+from app.core.metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "SQL statements executed per HTTP request.",
+    labelnames=("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Total time spent in SQL statements per HTTP request.",
+    labelnames=("method", "route"),
+)
+REQUEST_DB_SLOWEST_SECONDS = Histogram(
+    "http_request_db_slowest_statement_seconds",
+    "Duration of the slowest SQL statement of each HTTP request.",
+    labelnames=("method", "route"),
+)
+REQUEST_N_PLUS_ONE = Counter(
+    "http_request_db_n_plus_one_total",
+    "Requests that repeated the same normalized SQL statement above the threshold.",
+    labelnames=("method", "route"),
+)
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN \((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def normalize_sql(statement: str) -> str:
+    """Sentencia sin literales ni listas IN, para agrupar las que solo cambian en los parametros."""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _IN_LIST.sub("IN (...)", statement)
+    return _LITERALS.sub("?", statement)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+    statements: StatementCounter = field(default_factory=StatementCounter)
+
+    def record(self, statement: str, seconds: float) -> None:
+        normalized = normalize_sql(statement)
+        self.count += 1
+        self.total_seconds += seconds
+        self.statements[normalized] += 1
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = normalized
+
+    def repeated(self, threshold: int) -> tuple[str, int] | None:
+        """La sentencia mas repetida si supera el umbral (patron N+1)."""
+        if not self.statements:
+            return None
+        statement, times = self.statements.most_common(1)[0]
+        return (statement, times) if times > threshold else None
+
+
+# Las rutas sync corren en el threadpool con una copia del contexto: comparten este objeto.
+_current_stats: ContextVar[QueryStats | None] = ContextVar("sql_query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_stats.get() is not None and context is not None:
+        context.sql_stats_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+    started = getattr(context, "sql_stats_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Registra los eventos que cuentan y miden las sentencias del request en curso."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _header_text(value: str, limit: int = 200) -> str:
+    return value[:limit].encode("latin-1", "replace").decode("latin-1")
+
+
+class SQLStatsMiddleware:
+    """
+    Mide las sentencias SQL de cada request: Server-Timing, headers X-DB-* (solo en debug),
+    histogramas en /metrics y aviso cuando la misma sentencia se repite mas de n_plus_one_threshold veces.
+    Los headers se arman al enviar el inicio de la respuesta; en streaming las sentencias
+    posteriores solo llegan a las metricas.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        server_timing: bool = True,
+        debug_headers: bool = False,
+        n_plus_one_threshold: int = 10,
+    ) -> None:
+        self.app = app
+        self.server_timing = server_timing
+        self.debug_headers = debug_headers
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                self._add_headers(MutableHeaders(scope=message), stats)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current_stats.reset(token)
+            self._observe(scope, stats)
+
+    def _add_headers(self, headers: MutableHeaders, stats: QueryStats) -> None:
+        if self.server_timing:
+            headers.append("Server-Timing", f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} queries"')
+        if not self.debug_headers:
+            return
+        headers["X-DB-Query-Count"] = str(stats.count)
+        headers["X-DB-Time-Ms"] = f"{stats.total_seconds * 1000:.1f}"
+        if stats.slowest_statement is not None:
+            headers["X-DB-Slowest-Ms"] = f"{stats.slowest_seconds * 1000:.1f}"
+            headers["X-DB-Slowest-Statement"] = _header_text(stats.slowest_statement)
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        if repeated is not None:
+            statement, times = repeated
+            headers["X-DB-N-Plus-One"] = _header_text(f"{times}x {statement}")
+
+    def _observe(self, scope: Scope, stats: QueryStats) -> None:
+        labels = {"method": scope["method"], "route": route_label(scope)}
+        REQUEST_DB_STATEMENTS.observe(stats.count, **labels)
+        if stats.count:
+            REQUEST_DB_SECONDS.observe(stats.total_seconds, **labels)
+            REQUEST_DB_SLOWEST_SECONDS.observe(stats.slowest_seconds, **labels)
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        if repeated is not None:
+            REQUEST_N_PLUS_ONE.inc(**labels)
+            logger.warning(
+                "Possible N+1 in %s %s: statement repeated %d times: %s",
+                labels["method"],
+                labels["route"],
+                repeated[1],
+                repeated[0],
+            )
@@ -1,12 +1,35 @@
-from app.crud import catalog, category, product, product_image, product_variant, sale, sale_item, user
+from app.crud import (
+    analytics,
+    async_catalog,
+    async_sale,
+    async_user,
+    catalog,
+    catalog_import,
+    catalog_search,
+    category,
+    product,
+    product_image,
+    product_variant,
+    sale,
+    sale_item,
+    sku_stock,
+    user,
+)
 
 __all__ = [
+    "analytics",
+    "async_catalog",
+    "async_sale",
+    "async_user",
     "catalog",
+    "catalog_import",
+    "catalog_search",
     "category",
     "product",
     "product_variant",
     "product_image",
     "sale",
     "sale_item",
+    "sku_stock",
     "user",
 ]
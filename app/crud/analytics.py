@@ -0,0 +1,218 @@
+from collections.abc import Iterable
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from sqlalchemy import delete, distinct, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.db import upsert_insert
+from app.models.Sale import Sale
+from app.models.SaleItem import SaleItem
+from app.models.SalesRollup import SalesDaily, SalesDailyCategory, SalesDailyProduct
+
+# (product_id, category_id, unidades, importe); valores negativos descuentan del agregado.
+# category_id es el que se guardo en la linea al vender, aunque el producto cambie de categoria.
+RollupLine = tuple[int, int, int, Decimal]
+
+
+def sale_lines(items: Iterable[SaleItem], sign: int = 1) -> list[RollupLine]:
+    return [
+        (item.product_id, item.category_id, sign * item.quantity, sign * Decimal(str(item.unit_price)) * item.quantity)
+        for item in items
+    ]
+
+
+def _upsert_add(db: Session, model, key_columns: tuple[str, ...], rows: list[dict]) -> None:
+    if not rows:
+        return
+    insert_stmt = upsert_insert(db)
+    statement = insert_stmt(model).values(rows)
+    additive = [name for name in rows[0] if name not in key_columns]
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={name: getattr(model, name) + getattr(statement.excluded, name) for name in additive},
+        )
+    )
+
+
+def apply_sale_delta(db: Session, day: date, lines: list[RollupLine], sales_count: int = 0) -> None:
+    """
+    Suma (o resta) una venta a los agregados del dia; no confirma la transaccion.
+    Las filas se escriben en orden de clave para que ventas concurrentes no se bloqueen en cruz.
+    """
+    by_product: dict[int, list] = {}
+    by_category: dict[int, list] = {}
+    for product_id, category_id, units, revenue in lines:
+        for totals in (
+            by_product.setdefault(product_id, [0, Decimal("0")]),
+            by_category.setdefault(category_id, [0, Decimal("0")]),
+        ):
+            totals[0] += units
+            totals[1] += revenue
+
+    _upsert_add(
+        db,
+        SalesDaily,
+        ("day",),
+        [
+            {
+                "day": day,
+                "sales_count": sales_count,
+                "units": sum(units for units, _ in by_product.values()),
+                "revenue": sum((revenue for _, revenue in by_product.values()), Decimal("0")),
+            }
+        ],
+    )
+    _upsert_add(
+        db,
+        SalesDailyProduct,
+        ("day", "product_id"),
+        [
+            {"day": day, "product_id": product_id, "units": units, "revenue": revenue}
+            for product_id, (units, revenue) in sorted(by_product.items())
+        ],
+    )
+    _upsert_add(
+        db,
+        SalesDailyCategory,
+        ("day", "category_id"),
+        [
+            {"day": day, "category_id": category_id, "units": units, "revenue": revenue}
+            for category_id, (units, revenue) in sorted(by_category.items())
+        ],
+    )
+
+    if sales_count < 0 or any(units < 0 for _, _, units, _ in lines):
+        db.execute(delete(SalesDailyProduct).where(SalesDailyProduct.day == day, SalesDailyProduct.units <= 0))
+        db.execute(delete(SalesDailyCategory).where(SalesDailyCategory.day == day, SalesDailyCategory.units <= 0))
+        db.execute(delete(SalesDaily).where(SalesDaily.day == day, SalesDaily.sales_count <= 0))
+
+
+def _day_range(column, date_from: date | None, date_to: date | None) -> list:
+    conditions = []
+    if date_from is not None:
+        conditions.append(column >= date_from)
+    if date_to is not None:
+        conditions.append(column <= date_to)
+    return conditions
+
+
+def rebuild_rollups(db: Session, date_from: date | None = None, date_to: date | None = None) -> int:
+    """Recalcula los agregados del rango (ambos extremos incluidos) desde sales/sale_items."""
+    sale_filters = []
+    if date_from is not None:
+        sale_filters.append(Sale.date >= datetime.combine(date_from, time.min))
+    if date_to is not None:
+        sale_filters.append(Sale.date < datetime.combine(date_to + timedelta(days=1), time.min))
+
+    for model in (SalesDaily, SalesDailyProduct, SalesDailyCategory):
+        db.execute(delete(model).where(*_day_range(model.day, date_from, date_to)))
+
+    day = func.date(Sale.date)
+    units = func.sum(SaleItem.quantity)
+    revenue = func.sum(SaleItem.unit_price * SaleItem.quantity)
+    joined = select().select_from(Sale).join(SaleItem, SaleItem.sale_id == Sale.id).where(*sale_filters)
+
+    result = db.execute(
+        insert(SalesDaily).from_select(
+            ["day", "sales_count", "units", "revenue"],
+            joined.add_columns(day, func.count(distinct(Sale.id)), units, revenue).group_by(day),
+        )
+    )
+    db.execute(
+        insert(SalesDailyProduct).from_select(
+            ["day", "product_id", "units", "revenue"],
+            joined.add_columns(day, SaleItem.product_id, units, revenue).group_by(day, SaleItem.product_id),
+        )
+    )
+    db.execute(
+        insert(SalesDailyCategory).from_select(
+            ["day", "category_id", "units", "revenue"],
+            joined.add_columns(day, SaleItem.category_id, units, revenue).group_by(day, SaleItem.category_id),
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def _average(total, count: int) -> Decimal:
+    if not count:
+        return Decimal("0.00")
+    return (Decimal(str(total)) / count).quantize(Decimal("0.01"))
+
+
+def revenue_by_day(db: Session, date_from: date | None = None, date_to: date | None = None) -> list[dict]:
+    rows = (
+        db.query(SalesDaily)
+        .filter(*_day_range(SalesDaily.day, date_from, date_to))
+        .order_by(SalesDaily.day)
+        .all()
+    )
+    return [
+        {
+            "day": row.day,
+            "sales_count": row.sales_count,
+            "units": row.units,
+            "revenue": row.revenue,
+            "average_basket": _average(row.revenue, row.sales_count),
+        }
+        for row in rows
+    ]
+
+
+def units_by_product(
+    db: Session,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    limit: int = 50,
+) -> list[dict]:
+    units = func.sum(SalesDailyProduct.units)
+    rows = (
+        db.query(SalesDailyProduct.product_id, units, func.sum(SalesDailyProduct.revenue))
+        .filter(*_day_range(SalesDailyProduct.day, date_from, date_to))
+        .group_by(SalesDailyProduct.product_id)
+        .order_by(units.desc(), SalesDailyProduct.product_id)
+        .limit(limit)
+        .all()
+    )
+    return [{"product_id": product_id, "units": units, "revenue": revenue} for product_id, units, revenue in rows]
+
+
+def top_categories(
+    db: Session,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    limit: int = 10,
+) -> list[dict]:
+    revenue = func.sum(SalesDailyCategory.revenue)
+    rows = (
+        db.query(SalesDailyCategory.category_id, func.sum(SalesDailyCategory.units), revenue)
+        .filter(*_day_range(SalesDailyCategory.day, date_from, date_to))
+        .group_by(SalesDailyCategory.category_id)
+        .order_by(revenue.desc(), SalesDailyCategory.category_id)
+        .limit(limit)
+        .all()
+    )
+    return [{"category_id": category_id, "units": units, "revenue": revenue} for category_id, units, revenue in rows]
+
+
+def basket_summary(db: Session, date_from: date | None = None, date_to: date | None = None) -> dict:
+    sales_count, units, revenue = (
+        db.query(
+            func.coalesce(func.sum(SalesDaily.sales_count), 0),
+            func.coalesce(func.sum(SalesDaily.units), 0),
+            func.coalesce(func.sum(SalesDaily.revenue), 0),
+        )
+        .filter(*_day_range(SalesDaily.day, date_from, date_to))
+        .one()
+    )
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "sales_count": sales_count,
+        "units": units,
+        "revenue": revenue,
+        "average_basket": _average(revenue, sales_count),
+        "average_units": _average(units, sales_count),
+    }
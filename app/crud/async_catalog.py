@@ -0,0 +1,68 @@
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.crud.catalog import NO_PRODUCT_FILTERS, ProductFilters, paginate_products_query, product_summary_query
+from app.models.Products import Product
+from app.models.productVariant import ProductVariant
+
+
+async def list_products(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 50,
+    only_active: bool = True,
+    after_id: int | None = None,
+    filters: ProductFilters = NO_PRODUCT_FILTERS,
+    after_key: Any = None,
+) -> Sequence[Product]:
+    query = select(Product).options(
+        selectinload(Product.variants).selectinload(ProductVariant.images),
+    )
+    result = await db.scalars(paginate_products_query(query, skip, limit, only_active, after_id, filters, after_key))
+    return result.all()
+
+
+async def list_product_summaries(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 50,
+    only_active: bool = True,
+    after_id: int | None = None,
+    filters: ProductFilters = NO_PRODUCT_FILTERS,
+    after_key: Any = None,
+) -> Sequence[Any]:
+    query = paginate_products_query(product_summary_query(), skip, limit, only_active, after_id, filters, after_key)
+    result = await db.execute(query)
+    return result.all()
+
+
+async def list_product_versions(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 50,
+    only_active: bool = True,
+    after_id: int | None = None,
+    filters: ProductFilters = NO_PRODUCT_FILTERS,
+    after_key: Any = None,
+) -> list[tuple[int, int]]:
+    query = select(Product.id, Product.version)
+    result = await db.execute(paginate_products_query(query, skip, limit, only_active, after_id, filters, after_key))
+    return [tuple(row) for row in result.all()]
+
+
+async def get_product_version(db: AsyncSession, product_id: int) -> int | None:
+    return await db.scalar(select(Product.version).filter(Product.id == product_id))
+
+
+async def get_product(db: AsyncSession, product_id: int) -> Product | None:
+    return await db.scalar(
+        select(Product)
+        .options(
+            selectinload(Product.variants).selectinload(ProductVariant.images),
+        )
+        .filter(Product.id == product_id)
+    )
@@ -0,0 +1,30 @@
+from collections.abc import Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.crud.sale import paginate_sales_query
+from app.models.Sale import Sale
+
+
+async def list_sales(db: AsyncSession, skip: int = 0, limit: int = 50, before_id: int | None = None) -> Sequence[Sale]:
+    query = select(Sale).options(selectinload(Sale.items))
+    result = await db.scalars(paginate_sales_query(query, skip, limit, before_id))
+    return result.all()
+
+
+async def list_sales_by_user(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 50,
+    before_id: int | None = None,
+) -> Sequence[Sale]:
+    query = select(Sale).options(selectinload(Sale.items)).filter(Sale.user_id == user_id)
+    result = await db.scalars(paginate_sales_query(query, skip, limit, before_id))
+    return result.all()
+
+
+async def get_sale(db: AsyncSession, sale_id: int) -> Sale | None:
+    return await db.scalar(select(Sale).options(selectinload(Sale.items)).filter(Sale.id == sale_id))
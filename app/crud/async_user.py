@@ -0,0 +1,20 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import invalidate_user
+from app.models.User import User
+
+
+async def get_user_by_id(db: AsyncSession, user_id: int) -> User | None:
+    return await db.scalar(select(User).filter(User.id == user_id))
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
+    return await db.scalar(select(User).filter(User.email == email))
+
+
+async def update_password_hash(db: AsyncSession, user: User, hashed_password: str) -> User:
+    user.hashed_password = hashed_password
+    await db.commit()
+    invalidate_user(user.id)
+    return user
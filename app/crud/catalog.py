@@ -1,25 +1,268 @@
 from collections.abc import Sequence
-from decimal import Decimal
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any
 
+from sqlalchemy import func, or_, select, tuple_, update
 from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.cache import invalidate_product
+from app.core.db import commit_loaded
+from app.crud.sku_stock import SkuStock, sku_stock_index
 from app.models.productImage import ProductImage
 from app.models.Products import Product
 from app.models.productVariant import ProductVariant
 
 
-def list_products(db: Session, skip: int = 0, limit: int = 50, only_active: bool = True) -> Sequence[Product]:
+CENT = Decimal("0.01")
+
+
+def to_money(value: Decimal | None) -> Decimal | None:
+    """Redondea a la escala de las columnas Numeric(10, 2), igual que lo guarda la base."""
+    return None if value is None else value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+# sort -> (columna de la clave de orden, descendente). "newest" usa el id (es creciente).
+PRODUCT_SORTS: dict[str, tuple[str | None, bool]] = {
+    "id": (None, False),
+    "newest": (None, True),
+    "price": ("min_price", False),
+    "-price": ("min_price", True),
+    "name": ("name", False),
+}
+
+
+@dataclass(frozen=True)
+class ProductFilters:
+    category_id: int | None = None
+    min_price: Decimal | None = None
+    max_price: Decimal | None = None
+    size: str | None = None
+    color: str | None = None
+    in_stock: bool = False
+    sort: str = "id"
+
+    @property
+    def is_default(self) -> bool:
+        return self == NO_PRODUCT_FILTERS
+
+    @property
+    def sort_column(self) -> str | None:
+        return PRODUCT_SORTS[self.sort][0]
+
+    def cursor_values(self, product) -> dict[str, Any]:
+        """Valores del cursor keyset (orden, clave de orden, id) para la fila product."""
+        if self.sort_column is None:
+            return {"sort": self.sort, "id": product.id}
+        return {"sort": self.sort, "key": getattr(product, self.sort_column), "id": product.id}
+
+
+NO_PRODUCT_FILTERS = ProductFilters()
+
+
+def paginate_products_query(
+    query,
+    skip: int,
+    limit: int,
+    only_active: bool,
+    after_id: int | None,
+    filters: ProductFilters = NO_PRODUCT_FILTERS,
+    after_key: Any = None,
+):
+    """
+    Aplica filtros, orden y paginacion. Con after_id se pagina por keyset sobre (clave de orden, id),
+    que es lo que cubren los indices compuestos de la migracion 0006.
+    """
+    if only_active:
+        query = query.filter(Product.is_active.is_(True))
+    if filters.category_id is not None:
+        query = query.filter(Product.category_id == filters.category_id)
+    # Rango de precios del producto (min/max efectivos) que se solapa con el pedido.
+    if filters.min_price is not None:
+        query = query.filter(Product.max_price >= filters.min_price)
+    if filters.max_price is not None:
+        query = query.filter(Product.min_price <= filters.max_price)
+
+    variant_conditions = []
+    if filters.size is not None:
+        variant_conditions.append(ProductVariant.size == filters.size)
+    if filters.color is not None:
+        variant_conditions.append(ProductVariant.color == filters.color)
+    if filters.in_stock:
+        if variant_conditions:
+            variant_conditions.append(ProductVariant.stock > 0)
+        else:
+            query = query.filter(Product.total_stock > 0)
+    if variant_conditions:
+        query = query.filter(
+            select(ProductVariant.id)
+            .where(
+                ProductVariant.product_id == Product.id,
+                ProductVariant.is_active.is_(True),
+                *variant_conditions,
+            )
+            .exists()
+        )
+
+    column_name, descending = PRODUCT_SORTS[filters.sort]
+    if column_name is None:
+        query = query.order_by(Product.id.desc() if descending else Product.id)
+        if after_id is not None:
+            query = query.filter(Product.id < after_id if descending else Product.id > after_id)
+    else:
+        column = getattr(Product, column_name)
+        query = query.order_by(*((column.desc(), Product.id.desc()) if descending else (column, Product.id)))
+        if after_id is not None:
+            position, bound = tuple_(column, Product.id), tuple_(after_key, after_id)
+            query = query.filter(position < bound if descending else position > bound)
+    if after_id is None:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def list_products(
+    db: Session,
+    skip: int = 0,
+    limit: int = 50,
+    only_active: bool = True,
+    after_id: int | None = None,
+    filters: ProductFilters = NO_PRODUCT_FILTERS,
+    after_key: Any = None,
+) -> Sequence[Product]:
+    query = db.query(Product).options(
+        selectinload(Product.variants).selectinload(ProductVariant.images),
+    )
+    return paginate_products_query(query, skip, limit, only_active, after_id, filters, after_key).all()
+
+
+def product_summary_query():
+    """Proyeccion angosta para view=summary: una sola tabla, usando las columnas de resumen."""
+    return select(
+        Product.id,
+        Product.name,
+        Product.price,
+        Product.min_price,
+        Product.max_price,
+        Product.category_id,
+        Product.version,
+        Product.primary_image_url.label("image_url"),
+        (Product.total_stock > 0).label("in_stock"),
+    )
+
+
+def list_product_summaries(
+    db: Session,
+    skip: int = 0,
+    limit: int = 50,
+    only_active: bool = True,
+    after_id: int | None = None,
+    filters: ProductFilters = NO_PRODUCT_FILTERS,
+    after_key: Any = None,
+) -> Sequence[Any]:
+    query = paginate_products_query(product_summary_query(), skip, limit, only_active, after_id, filters, after_key)
+    return db.execute(query).all()
+
+
+def list_product_versions(
+    db: Session,
+    skip: int = 0,
+    limit: int = 50,
+    only_active: bool = True,
+    after_id: int | None = None,
+    filters: ProductFilters = NO_PRODUCT_FILTERS,
+    after_key: Any = None,
+) -> list[tuple[int, int]]:
+    """Devuelve los pares (id, version) de la misma pagina que list_products, sin cargar variantes."""
+    query = db.query(Product.id, Product.version)
+    return [
+        tuple(row)
+        for row in paginate_products_query(query, skip, limit, only_active, after_id, filters, after_key).all()
+    ]
+
+
+def get_product_version(db: Session, product_id: int) -> int | None:
+    return db.query(Product.version).filter(Product.id == product_id).scalar()
+
+
+def product_summary_values() -> dict:
+    """Subconsultas correlacionadas que recalculan las columnas de resumen de cada producto."""
+    active_variant = (ProductVariant.product_id == Product.id, ProductVariant.is_active.is_(True))
+    effective_price = func.coalesce(ProductVariant.price_override, Product.price)
+    return {
+        "min_price": func.coalesce(
+            select(func.min(effective_price)).where(*active_variant).scalar_subquery(),
+            Product.price,
+        ),
+        "max_price": func.coalesce(
+            select(func.max(effective_price)).where(*active_variant).scalar_subquery(),
+            Product.price,
+        ),
+        "total_stock": func.coalesce(
+            select(func.sum(ProductVariant.stock)).where(*active_variant).scalar_subquery(),
+            0,
+        ),
+        "active_variant_count": select(func.count(ProductVariant.id)).where(*active_variant).scalar_subquery(),
+        "primary_image_url": (
+            select(ProductImage.image_url)
+            .join(ProductVariant, ProductVariant.id == ProductImage.product_variant_id)
+            .where(*active_variant, ProductImage.position == 1)
+            .order_by(ProductVariant.id)
+            .limit(1)
+            .scalar_subquery()
+        ),
+    }
+
+
+def bump_product_versions(db: Session, *product_ids: int) -> None:
+    """Incrementa la version y recalcula las columnas de resumen de los productos."""
+    # Se escriben primero las filas hijas (variantes/imagenes) y despues se bloquean los productos
+    # en orden de id, el mismo orden que usan las ventas, para no generar deadlocks.
+    db.flush()
+    summary = product_summary_values()
+    columns = ("version", *summary)
+    for product_id in sorted(set(product_ids)):
+        row = db.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values({Product.version: Product.version + 1, **summary})
+            .returning(*(getattr(Product, column) for column in columns))
+            .execution_options(synchronize_session=False)
+        ).first()
+        # El RETURNING actualiza el producto si ya esta en la sesion, sin otro SELECT al leerlo.
+        product = db.identity_map.get(Session.identity_key(Product, product_id))
+        if product is not None and row is not None:
+            for column, value in zip(columns, row):
+                set_committed_value(product, column, value)
+
+
+def find_product_summary_mismatches(db: Session, limit: int | None = None) -> list[int]:
+    """Ids de los productos cuyas columnas de resumen no coinciden con sus variantes."""
     query = (
-        db.query(Product)
-        .options(
-            selectinload(Product.variants).selectinload(ProductVariant.images),
+        db.query(Product.id)
+        .filter(
+            or_(
+                *(
+                    getattr(Product, column).is_distinct_from(expected)
+                    for column, expected in product_summary_values().items()
+                )
+            )
         )
-        .offset(skip)
-        .limit(limit)
+        .order_by(Product.id)
     )
-    if only_active:
-        query = query.filter(Product.is_active.is_(True))
-    return query.all()
+    if limit is not None:
+        query = query.limit(limit)
+    return [product_id for (product_id,) in query.all()]
+
+
+def repair_product_summaries(db: Session, product_ids: list[int], batch_size: int = 500) -> int:
+    for start in range(0, len(product_ids), batch_size):
+        batch = product_ids[start:start + batch_size]
+        bump_product_versions(db, *batch)
+        db.commit()
+        for product_id in batch:
+            invalidate_product(product_id, lists=True)
+    return len(product_ids)
 
 
 def get_product(db: Session, product_id: int) -> Product | None:
@@ -42,16 +285,22 @@ def create_product(
     category_id: int,
     is_active: bool = True,
 ) -> Product:
+    price = to_money(price)
     product = Product(
         name=name,
         description=description,
         price=price,
         category_id=category_id,
         is_active=is_active,
+        min_price=price,
+        max_price=price,
+        total_stock=0,
+        active_variant_count=0,
+        variants=[],
     )
     db.add(product)
-    db.commit()
-    db.refresh(product)
+    commit_loaded(db)
+    invalidate_product(product.id, lists=True)
     return product
 
 
@@ -70,20 +319,25 @@ def update_product(
     if description is not None:
         product.description = description
     if price is not None:
-        product.price = price
+        product.price = to_money(price)
     if category_id is not None:
         product.category_id = category_id
     if is_active is not None:
         product.is_active = is_active
+    bump_product_versions(db, product.id)
 
-    db.commit()
-    db.refresh(product)
+    commit_loaded(db)
+    invalidate_product(product.id, lists=is_active is not None)
+    sku_stock_index.discard_products(product.id)
     return product
 
 
 def delete_product(db: Session, product: Product) -> None:
+    product_id = product.id
     db.delete(product)
     db.commit()
+    invalidate_product(product_id, lists=True)
+    sku_stock_index.discard_products(product_id)
 
 
 def list_variants_by_product(db: Session, product_id: int) -> Sequence[ProductVariant]:
@@ -135,30 +389,37 @@ def create_variant(
     positions = [position for _, position in images]
     _validate_variant_images(positions)
 
+    # Las imagenes van en la coleccion (ordenadas como las carga la relacion), asi la variante
+    # se devuelve completa desde la sesion sin volver a consultarla.
     variant = ProductVariant(
         product_id=product_id,
         sku=sku,
         size=size,
         color=color,
         stock=stock,
-        price_override=price_override,
+        price_override=to_money(price_override),
         is_active=is_active,
+        images=[
+            ProductImage(image_url=image_url, position=position)
+            for image_url, position in sorted(images, key=lambda image: image[1])
+        ],
     )
     db.add(variant)
-    db.flush()
-
-    for image_url, position in images:
-        db.add(
-            ProductImage(
-                product_variant_id=variant.id,
-                image_url=image_url,
-                position=position,
-            )
+    bump_product_versions(db, product_id)
+
+    commit_loaded(db)
+    invalidate_product(variant.product_id)
+    sku_stock_index.put(
+        SkuStock(
+            sku=variant.sku,
+            variant_id=variant.id,
+            product_id=product_id,
+            stock=variant.stock,
+            price=Decimal(str(variant.price_override if variant.price_override is not None else product.price)),
+            is_active=bool(variant.is_active and product.is_active),
         )
-
-    db.commit()
-    db.refresh(variant)
-    return get_variant(db, variant.id)  # type: ignore[return-value]
+    )
+    return variant
 
 
 def update_variant(
@@ -172,6 +433,7 @@ def update_variant(
     price_override: Decimal | None = None,
     is_active: bool | None = None,
 ) -> ProductVariant:
+    previous_sku = variant.sku
     if sku is not None and sku != variant.sku:
         existing_sku = (
             db.query(ProductVariant)
@@ -188,18 +450,24 @@ def update_variant(
     if stock is not None:
         variant.stock = stock
     if price_override is not None:
-        variant.price_override = price_override
+        variant.price_override = to_money(price_override)
     if is_active is not None:
         variant.is_active = is_active
+    bump_product_versions(db, variant.product_id)
 
-    db.commit()
-    db.refresh(variant)
-    return get_variant(db, variant.id)  # type: ignore[return-value]
+    commit_loaded(db)
+    invalidate_product(variant.product_id)
+    sku_stock_index.discard(previous_sku, variant.sku)
+    return variant
 
 
 def delete_variant(db: Session, variant: ProductVariant) -> None:
+    product_id, sku = variant.product_id, variant.sku
     db.delete(variant)
+    bump_product_versions(db, product_id)
     db.commit()
+    invalidate_product(product_id)
+    sku_stock_index.discard(sku)
 
 
 def create_variant_image(
@@ -237,8 +505,9 @@ def create_variant_image(
         position=position,
     )
     db.add(image)
-    db.commit()
-    db.refresh(image)
+    bump_product_versions(db, variant.product_id)
+    commit_loaded(db)
+    invalidate_product(variant.product_id)
     return image
 
 
@@ -270,12 +539,17 @@ def update_variant_image(
         image.position = position
     if image_url is not None:
         image.image_url = image_url
+    product_id = image.product_variant.product_id
+    bump_product_versions(db, product_id)
 
-    db.commit()
-    db.refresh(image)
+    commit_loaded(db)
+    invalidate_product(product_id)
     return image
 
 
 def delete_variant_image(db: Session, image: ProductImage) -> None:
+    product_id = image.product_variant.product_id
     db.delete(image)
+    bump_product_versions(db, product_id)
     db.commit()
+    invalidate_product(product_id)
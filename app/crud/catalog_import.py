@@ -0,0 +1,306 @@
+import csv
+import json
+import math
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.cache import PRODUCT_LIST_TAG, PRODUCT_QUERY_LIST_TAG, get_catalog_cache, product_tag
+from app.core.config import settings
+from app.core.db import upsert_insert
+from app.crud.catalog import bump_product_versions
+from app.crud.sku_stock import sku_stock_index
+from app.models.Category import Category
+from app.models.productImage import ProductImage
+from app.models.Products import Product
+from app.models.productVariant import ProductVariant
+from app.schemas.catalog import CatalogImportError, CatalogImportReport, CatalogImportRow
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+ImportRecord = tuple[int, dict[str, Any] | None, str | None]
+
+
+@dataclass
+class _ChunkResult:
+    rows: list[tuple[int, CatalogImportRow]] = field(default_factory=list)
+    product_ids: set[int] = field(default_factory=set)
+    products_created: int = 0
+    products_updated: int = 0
+    variants_upserted: int = 0
+    images_upserted: int = 0
+    # Filas con su propio error; un error de base del lote no les agrega otro.
+    failed_rows: set[int] = field(default_factory=set)
+
+
+def iter_import_records(stream: TextIO, file_format: str) -> Iterator[ImportRecord]:
+    """
+    Lee el archivo fila por fila (sin cargarlo entero en memoria).
+    Devuelve (numero de fila, registro, error de parseo).
+    """
+    if file_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {file_format}.")
+
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        for row_number, record in enumerate(reader, start=2):
+            yield row_number, {k: v for k, v in record.items() if k is not None and v not in ("", None)}, None
+        return
+
+    for row_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield row_number, None, f"Invalid JSON: {exc.msg}."
+            continue
+        if not isinstance(record, dict):
+            yield row_number, None, "Each line must be a JSON object."
+            continue
+        yield row_number, record, None
+
+
+def _add_error(report: CatalogImportReport, row_number: int, sku: str | None, message: str) -> None:
+    if len(report.errors) >= settings.CATALOG_IMPORT_MAX_ERRORS:
+        report.errors_truncated = True
+        return
+    report.errors.append(CatalogImportError(row=row_number, sku=sku, message=message))
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+def _resolve_products(
+    db: Session,
+    chunk: list[tuple[int, CatalogImportRow]],
+    result: _ChunkResult,
+    report: CatalogImportReport,
+) -> tuple[list[tuple[int, CatalogImportRow, Product]], dict[int, dict[str, Any]]]:
+    """
+    Crea los productos nuevos del lote y devuelve las filas resueltas y los cambios pendientes
+    de los productos existentes (por id). Esos cambios se aplican despues del upsert de variantes,
+    para bloquear variantes y productos en el mismo orden que las ventas.
+    """
+
+    def reject(row_number: int, row: CatalogImportRow, message: str) -> None:
+        result.failed_rows.add(row_number)
+        _add_error(report, row_number, row.sku, message)
+
+    ids = {row.product_id for _, row in chunk if row.product_id is not None}
+    by_id = {product.id: product for product in db.query(Product).filter(Product.id.in_(ids))} if ids else {}
+
+    keys = {(row.product_name, row.category_id) for _, row in chunk if row.product_id is None}
+    by_key: dict[tuple[str, int], Product] = {}
+    if keys:
+        candidates = (
+            db.query(Product)
+            .filter(
+                Product.name.in_({name for name, _ in keys}),
+                Product.category_id.in_({category_id for _, category_id in keys}),
+            )
+            .order_by(Product.id)
+        )
+        for product in candidates:
+            by_key.setdefault((product.name, product.category_id), product)
+
+    category_ids = {row.category_id for _, row in chunk if row.category_id is not None}
+    existing_categories = (
+        {category_id for (category_id,) in db.query(Category.id).filter(Category.id.in_(category_ids))}
+        if category_ids
+        else set()
+    )
+
+    created: set[int] = set()
+    updates: dict[int, dict[str, Any]] = {}
+    resolved = []
+    for row_number, row in chunk:
+        if row.category_id is not None and row.category_id not in existing_categories:
+            reject(row_number, row, f"Category {row.category_id} not found.")
+            continue
+
+        if row.product_id is not None:
+            product = by_id.get(row.product_id)
+            if product is None:
+                reject(row_number, row, f"Product {row.product_id} not found.")
+                continue
+        else:
+            product = by_key.get((row.product_name, row.category_id))
+            if product is None:
+                if row.price is None:
+                    reject(row_number, row, "price is required to create a product.")
+                    continue
+                product = Product(
+                    name=row.product_name,
+                    category_id=row.category_id,
+                    price=row.price,
+                    is_active=True,
+                )
+                db.add(product)
+                by_key[(row.product_name, row.category_id)] = product
+                created.add(id(product))
+
+        changes: dict[str, Any] = {}
+        if row.product_id is not None and row.product_name is not None:
+            changes["name"] = row.product_name
+        if row.product_id is not None and row.category_id is not None:
+            changes["category_id"] = row.category_id
+        if row.description is not None:
+            changes["description"] = row.description
+        if row.price is not None:
+            changes["price"] = row.price
+        if row.product_is_active is not None:
+            changes["is_active"] = row.product_is_active
+        if id(product) in created:
+            for column, value in changes.items():
+                setattr(product, column, value)
+        else:
+            updates.setdefault(product.id, {}).update(changes)
+        resolved.append((row_number, row, product))
+
+    # Solo INSERT de productos nuevos: todavia no se bloquea ninguna fila existente.
+    db.flush()
+    result.products_created += len(created)
+    result.products_updated += len(updates)
+    return resolved, updates
+
+
+def _apply_product_updates(db: Session, updates: dict[int, dict[str, Any]]) -> None:
+    for product_id in sorted(updates):
+        product = db.get(Product, product_id)
+        for column, value in updates[product_id].items():
+            setattr(product, column, value)
+
+
+def _import_chunk(db: Session, chunk: list[tuple[int, CatalogImportRow]], report: CatalogImportReport) -> None:
+    result = _ChunkResult()
+    seen_skus: set[str] = set()
+    unique_rows = []
+    for row_number, row in chunk:
+        if row.sku in seen_skus:
+            _add_error(report, row_number, row.sku, "Duplicate SKU within the import batch.")
+            continue
+        seen_skus.add(row.sku)
+        unique_rows.append((row_number, row))
+
+    try:
+        existing = {
+            sku: (variant_id, product_id)
+            for variant_id, sku, product_id in db.query(
+                ProductVariant.id, ProductVariant.sku, ProductVariant.product_id
+            ).filter(ProductVariant.sku.in_(seen_skus))
+        }
+        # Las variantes existentes se actualizan en orden de id (como en las ventas) y las nuevas por SKU.
+        unique_rows.sort(key=lambda item: (existing.get(item[1].sku, (math.inf,))[0], item[1].sku))
+
+        resolved, product_updates = _resolve_products(db, unique_rows, result, report)
+        if resolved:
+            insert = upsert_insert(db)
+            # Si un SKU cambia de producto, el producto anterior tambien tiene que recalcular su resumen.
+            previous_product_ids = {existing[row.sku][1] for _, row, _ in resolved if row.sku in existing}
+
+            variant_values = [
+                {
+                    "product_id": product.id,
+                    "sku": row.sku,
+                    "size": row.size,
+                    "color": row.color,
+                    "stock": row.stock,
+                    "price_override": row.price_override,
+                    "is_active": row.is_active,
+                }
+                for _, row, product in resolved
+            ]
+            statement = insert(ProductVariant).values(variant_values)
+            statement = statement.on_conflict_do_update(
+                index_elements=[ProductVariant.sku],
+                set_={
+                    column: statement.excluded[column]
+                    for column in ("product_id", "size", "color", "stock", "price_override", "is_active")
+                },
+            ).returning(ProductVariant.id, ProductVariant.sku)
+            variant_ids = {sku: variant_id for variant_id, sku in db.execute(statement)}
+
+            image_values = [
+                {"product_variant_id": variant_ids[row.sku], "image_url": image_url, "position": position}
+                for _, row, _ in resolved
+                for position, image_url in enumerate(row.images, start=1)
+            ]
+            if image_values:
+                statement = insert(ProductImage).values(image_values)
+                statement = statement.on_conflict_do_update(
+                    index_elements=[ProductImage.product_variant_id, ProductImage.position],
+                    set_={"image_url": statement.excluded.image_url},
+                )
+                db.execute(statement)
+
+            _apply_product_updates(db, product_updates)
+            result.product_ids = {product.id for _, _, product in resolved} | previous_product_ids
+            result.variants_upserted = len(variant_values)
+            result.images_upserted = len(image_values)
+            result.rows = [(row_number, row) for row_number, row, _ in resolved]
+            bump_product_versions(db, *result.product_ids)
+        db.commit()
+    except SQLAlchemyError as exc:
+        db.rollback()
+        message = f"Database error, batch not imported: {exc.__class__.__name__}."
+        for row_number, row in unique_rows:
+            # Las filas que ya tienen su error (categoria o producto inexistente) no suman otro.
+            if row_number not in result.failed_rows:
+                _add_error(report, row_number, row.sku, message)
+        return
+
+    report.rows_imported += len(result.rows)
+    report.products_created += result.products_created
+    report.products_updated += result.products_updated
+    report.variants_upserted += result.variants_upserted
+    report.images_upserted += result.images_upserted
+    if result.product_ids:
+        tags = [PRODUCT_QUERY_LIST_TAG, *(product_tag(product_id) for product_id in result.product_ids)]
+        if result.products_created or result.products_updated:
+            tags.append(PRODUCT_LIST_TAG)
+        get_catalog_cache().invalidate_tags(*tags)
+        sku_stock_index.discard_products(*result.product_ids)
+
+
+def import_catalog(
+    db: Session,
+    records: Iterable[ImportRecord],
+    *,
+    chunk_size: int | None = None,
+) -> CatalogImportReport:
+    """
+    Upsert masivo de productos, variantes (ON CONFLICT (sku)) e imagenes
+    (ON CONFLICT (product_variant_id, position)), en lotes con un commit por lote.
+    """
+    chunk_size = chunk_size or settings.CATALOG_IMPORT_CHUNK_SIZE
+    report = CatalogImportReport()
+    chunk: list[tuple[int, CatalogImportRow]] = []
+    for row_number, record, error in records:
+        report.rows_total += 1
+        if error is not None:
+            _add_error(report, row_number, None, error)
+            continue
+        try:
+            row = CatalogImportRow.model_validate(record)
+        except ValidationError as exc:
+            sku = record.get("sku")
+            _add_error(report, row_number, str(sku) if sku else None, _validation_message(exc))
+            continue
+
+        chunk.append((row_number, row))
+        if len(chunk) >= chunk_size:
+            _import_chunk(db, chunk, report)
+            chunk = []
+
+    if chunk:
+        _import_chunk(db, chunk, report)
+    report.errors.sort(key=lambda error: error.row)
+    return report
@@ -0,0 +1,336 @@
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+
+from sqlalchemy import and_, distinct, func, literal, literal_column, or_, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import settings
+from app.models.Products import Product
+from app.models.productVariant import ProductVariant
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+# Tiene que coincidir con la expresion del indice GIN de la migracion 0005.
+TSVECTOR_SQL = "to_tsvector('simple', coalesce(products.name, '') || ' ' || coalesce(products.description, ''))"
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    category_ids: tuple[int, ...] = ()
+    sizes: tuple[str, ...] = ()
+    colors: tuple[str, ...] = ()
+    min_price: Decimal | None = None
+    max_price: Decimal | None = None
+    in_stock: bool = False
+
+
+def tokenize(text: str | None) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def _facet_list(counts: Counter) -> list[dict]:
+    return [
+        {"value": value, "count": count}
+        for value, count in sorted(counts.items(), key=lambda entry: (-entry[1], str(entry[0])))
+    ]
+
+
+def _price_range(low, high) -> dict | None:
+    if low is None:
+        return None
+    return {"min": low, "max": high}
+
+
+# --- Postgres: tsvector + trigramas ---------------------------------------------------------
+
+
+def _postgres_search(db: Session, q: str | None, filters: SearchFilters, skip: int, limit: int):
+    variant_join = and_(ProductVariant.product_id == Product.id, ProductVariant.is_active.is_(True))
+    price = func.coalesce(ProductVariant.price_override, Product.price)
+
+    base = [Product.is_active.is_(True)]
+    rank = literal(0.0)
+    tokens = tokenize(q)
+    if tokens:
+        tsvector = literal_column(TSVECTOR_SQL)
+        tsquery = func.to_tsquery("simple", " & ".join(f"{token}:*" for token in tokens))
+        base.append(or_(tsvector.op("@@")(tsquery), Product.name.op("%")(q)))
+        rank = func.ts_rank(tsvector, tsquery) + func.similarity(Product.name, q)
+
+    conditions = {}
+    if filters.category_ids:
+        conditions["category"] = Product.category_id.in_(filters.category_ids)
+    if filters.sizes:
+        conditions["size"] = ProductVariant.size.in_(filters.sizes)
+    if filters.colors:
+        conditions["color"] = ProductVariant.color.in_(filters.colors)
+    if filters.min_price is not None or filters.max_price is not None:
+        conditions["price"] = and_(
+            price >= filters.min_price if filters.min_price is not None else True,
+            price <= filters.max_price if filters.max_price is not None else True,
+        )
+    if filters.in_stock:
+        conditions["in_stock"] = ProductVariant.stock > 0
+
+    def units(*columns, without: str | None = None):
+        return (
+            select(*columns)
+            .select_from(Product)
+            .outerjoin(ProductVariant, variant_join)
+            .where(*base, *(condition for name, condition in conditions.items() if name != without))
+        )
+
+    matched = units(Product.id.label("id"), rank.label("rank")).distinct().subquery()
+    total = db.scalar(select(func.count()).select_from(matched))
+    product_ids = list(
+        db.scalars(select(matched.c.id).order_by(matched.c.rank.desc(), matched.c.id).offset(skip).limit(limit))
+    )
+
+    product_count = func.count(distinct(Product.id))
+
+    def counts(column, without: str) -> list[dict]:
+        query = units(column, product_count, without=without).where(column.is_not(None)).group_by(column)
+        return _facet_list(Counter(dict(db.execute(query).all())))
+
+    facets = {
+        "categories": counts(Product.category_id, "category"),
+        "sizes": counts(ProductVariant.size, "size"),
+        "colors": counts(ProductVariant.color, "color"),
+        "in_stock": db.scalar(units(product_count, without="in_stock").where(ProductVariant.stock > 0)) or 0,
+        "price": _price_range(*db.execute(units(func.min(price), func.max(price), without="price")).one()),
+    }
+    return total, product_ids, facets
+
+
+# --- Indice en memoria (SQLite / desarrollo) ------------------------------------------------
+
+
+@dataclass(frozen=True)
+class _Unit:
+    size: str | None
+    color: str | None
+    price: Decimal
+    stock: int
+
+
+@dataclass(frozen=True)
+class _Document:
+    product_id: int
+    version: int
+    is_active: bool
+    category_id: int
+    name: str
+    name_tokens: frozenset[str]
+    tokens: frozenset[str]
+    units: tuple[_Unit, ...]
+
+
+def _unit_matches(unit: _Unit, filters: SearchFilters, without: str | None) -> bool:
+    if filters.sizes and without != "size" and unit.size not in filters.sizes:
+        return False
+    if filters.colors and without != "color" and unit.color not in filters.colors:
+        return False
+    if without != "price":
+        if filters.min_price is not None and unit.price < filters.min_price:
+            return False
+        if filters.max_price is not None and unit.price > filters.max_price:
+            return False
+    if filters.in_stock and without != "in_stock" and unit.stock <= 0:
+        return False
+    return True
+
+
+class InMemorySearchIndex:
+    """
+    Indice invertido por prefijo de token, sincronizado contra (id, version) de los productos
+    antes de cada busqueda: solo se recargan los productos cuya version cambio, asi que
+    cualquier escritura del catalogo (en este u otro proceso) queda reflejada.
+    Cada busqueda lee solo una marca (cantidad, id maximo, suma de versiones); el mapa
+    id -> version completo se compara cuando la marca cambia. Toda escritura sube alguna
+    version, y las altas y bajas cambian la cantidad o el id maximo.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._documents: dict[int, _Document] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._sorted_tokens: list[str] = []
+        self._tokens_dirty = False
+        self._watermark: tuple | None = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._documents.clear()
+            self._postings.clear()
+            self._sorted_tokens = []
+            self._tokens_dirty = False
+            self._watermark = None
+
+    def sync(self, db: Session, chunk_size: int = 500) -> None:
+        watermark = tuple(db.query(func.count(Product.id), func.max(Product.id), func.sum(Product.version)).one())
+        if watermark == self._watermark:
+            return
+        versions = dict(db.query(Product.id, Product.version).all())
+        with self._lock:
+            for product_id in self._documents.keys() - versions.keys():
+                self._remove(product_id)
+            changed = [
+                product_id
+                for product_id, version in versions.items()
+                if product_id not in self._documents or self._documents[product_id].version != version
+            ]
+            for start in range(0, len(changed), chunk_size):
+                products = (
+                    db.query(Product)
+                    .options(selectinload(Product.variants))
+                    .filter(Product.id.in_(changed[start:start + chunk_size]))
+                    .all()
+                )
+                for product in products:
+                    self._remove(product.id)
+                    self._add(product)
+            # La marca se leyo antes que las versiones: si algo cambio en el medio, la proxima
+            # busqueda ve una marca distinta y vuelve a comparar.
+            self._watermark = watermark
+
+    def _remove(self, product_id: int) -> None:
+        document = self._documents.pop(product_id, None)
+        if document is None:
+            return
+        for token in document.tokens:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(product_id)
+                if not postings:
+                    del self._postings[token]
+                    self._tokens_dirty = True
+
+    def _add(self, product: Product) -> None:
+        units = tuple(
+            _Unit(
+                size=variant.size,
+                color=variant.color,
+                price=Decimal(str(variant.price_override if variant.price_override is not None else product.price)),
+                stock=variant.stock,
+            )
+            for variant in product.variants
+            if variant.is_active
+        ) or (_Unit(size=None, color=None, price=Decimal(str(product.price)), stock=0),)
+        name_tokens = frozenset(tokenize(product.name))
+        document = _Document(
+            product_id=product.id,
+            version=product.version,
+            is_active=product.is_active,
+            category_id=product.category_id,
+            name=product.name.lower(),
+            name_tokens=name_tokens,
+            tokens=name_tokens | frozenset(tokenize(product.description)),
+            units=units,
+        )
+        self._documents[product.id] = document
+        for token in document.tokens:
+            if token not in self._postings:
+                self._postings[token] = set()
+                self._tokens_dirty = True
+            self._postings[token].add(product.id)
+
+    def _prefix_matches(self, prefix: str) -> set[int]:
+        if self._tokens_dirty:
+            self._sorted_tokens = sorted(self._postings)
+            self._tokens_dirty = False
+        matches: set[int] = set()
+        position = bisect_left(self._sorted_tokens, prefix)
+        while position < len(self._sorted_tokens) and self._sorted_tokens[position].startswith(prefix):
+            matches |= self._postings[self._sorted_tokens[position]]
+            position += 1
+        return matches
+
+    def search(self, q: str | None, filters: SearchFilters, skip: int, limit: int):
+        with self._lock:
+            tokens = tokenize(q)
+            if tokens:
+                candidate_ids = set.intersection(*(self._prefix_matches(token) for token in tokens))
+                phrase = q.strip().lower()
+                candidate_ids |= {
+                    document.product_id for document in self._documents.values() if phrase in document.name
+                }
+                candidates = [self._documents[product_id] for product_id in candidate_ids]
+            else:
+                candidates = list(self._documents.values())
+
+        scored: list[tuple[int, int]] = []
+        categories: Counter = Counter()
+        sizes: Counter = Counter()
+        colors: Counter = Counter()
+        in_stock = 0
+        low = high = None
+        for document in candidates:
+            if not document.is_active:
+                continue
+            if any(_unit_matches(unit, filters, "category") for unit in document.units):
+                categories[document.category_id] += 1
+            if filters.category_ids and document.category_id not in filters.category_ids:
+                continue
+            if any(_unit_matches(unit, filters, None) for unit in document.units):
+                score = sum(1 for token in tokens if token in document.name_tokens)
+                scored.append((-score, document.product_id))
+            sizes.update({unit.size for unit in document.units if unit.size and _unit_matches(unit, filters, "size")})
+            colors.update(
+                {unit.color for unit in document.units if unit.color and _unit_matches(unit, filters, "color")}
+            )
+            if any(unit.stock > 0 and _unit_matches(unit, filters, "in_stock") for unit in document.units):
+                in_stock += 1
+            for unit in document.units:
+                if _unit_matches(unit, filters, "price"):
+                    low = unit.price if low is None else min(low, unit.price)
+                    high = unit.price if high is None else max(high, unit.price)
+
+        scored.sort()
+        facets = {
+            "categories": _facet_list(categories),
+            "sizes": _facet_list(sizes),
+            "colors": _facet_list(colors),
+            "in_stock": in_stock,
+            "price": _price_range(low, high),
+        }
+        return len(scored), [product_id for _, product_id in scored[skip:skip + limit]], facets
+
+
+memory_search_index = InMemorySearchIndex()
+
+
+def _use_postgres(db: Session) -> bool:
+    backend = settings.CATALOG_SEARCH_BACKEND
+    if backend == "auto":
+        return db.get_bind().dialect.name == "postgresql"
+    return backend == "postgres"
+
+
+def search_products(
+    db: Session,
+    q: str | None,
+    filters: SearchFilters,
+    skip: int = 0,
+    limit: int = 20,
+) -> tuple[int, Sequence[Product], dict]:
+    """Devuelve (total, productos de la pagina, facetas). Cada faceta ignora su propio filtro."""
+    if _use_postgres(db):
+        total, product_ids, facets = _postgres_search(db, q, filters, skip, limit)
+    else:
+        memory_search_index.sync(db)
+        total, product_ids, facets = memory_search_index.search(q, filters, skip, limit)
+
+    if not product_ids:
+        return total, [], facets
+    products = {
+        product.id: product
+        for product in db.query(Product)
+        .options(selectinload(Product.variants).selectinload(ProductVariant.images))
+        .filter(Product.id.in_(product_ids))
+    }
+    return total, [products[product_id] for product_id in product_ids if product_id in products], facets
@@ -3,11 +3,22 @@ from sqlalchemy.orm import Session
 from app.models.Category import Category
 
 
-def list_categories(db: Session, skip: int = 0, limit: int = 50, only_active: bool = True) -> list[Category]:
-    query = db.query(Category).offset(skip).limit(limit)
+def list_categories(
+    db: Session,
+    skip: int = 0,
+    limit: int = 50,
+    only_active: bool = True,
+    after_id: int | None = None,
+) -> list[Category]:
+    query = db.query(Category)
     if only_active:
         query = query.filter(Category.is_active.is_(True))
-    return query.all()
+    query = query.order_by(Category.id)
+    if after_id is not None:
+        query = query.filter(Category.id > after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 
 def get_category(db: Session, category_id: int) -> Category | None:
@@ -7,8 +7,14 @@ from app.crud import catalog
 from app.models.Products import Product
 
 
-def list_products(db: Session, skip: int = 0, limit: int = 50, only_active: bool = True) -> Sequence[Product]:
-    return catalog.list_products(db, skip=skip, limit=limit, only_active=only_active)
+def list_products(
+    db: Session,
+    skip: int = 0,
+    limit: int = 50,
+    only_active: bool = True,
+    after_id: int | None = None,
+) -> Sequence[Product]:
+    return catalog.list_products(db, skip=skip, limit=limit, only_active=only_active, after_id=after_id)
 
 
 def get_product(db: Session, product_id: int) -> Product | None:
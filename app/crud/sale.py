@@ -1,107 +1,439 @@
-from collections.abc import Sequence
-from datetime import datetime, timezone
+import hashlib
+import json
+import logging
+from collections.abc import Iterator, Sequence
+from datetime import date, datetime, timezone
 from decimal import Decimal
 
+from sqlalchemy import Row, delete, func, select, update
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, selectinload
 
+from app.core.cache import invalidate_product
+from app.core.db import commit_loaded, upsert_insert
+from app.crud import analytics, catalog
+from app.crud.sku_stock import sku_stock_index
 from app.models.Products import Product
+from app.models.productVariant import ProductVariant
 from app.models.Sale import Sale
+from app.models.SaleIdempotencyKey import SaleIdempotencyKey
 from app.models.SaleItem import SaleItem
 
+logger = logging.getLogger(__name__)
 
-def list_sales(db: Session, skip: int = 0, limit: int = 50) -> Sequence[Sale]:
-    return (
-        db.query(Sale)
-        .options(selectinload(Sale.items))
-        .order_by(Sale.id.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+def paginate_sales_query(query, skip: int, limit: int, before_id: int | None):
+    query = query.order_by(Sale.id.desc())
+    if before_id is not None:
+        query = query.filter(Sale.id < before_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
 
 
-def list_sales_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 50) -> Sequence[Sale]:
-    return (
-        db.query(Sale)
-        .options(selectinload(Sale.items))
-        .filter(Sale.user_id == user_id)
-        .order_by(Sale.id.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+def list_sales(db: Session, skip: int = 0, limit: int = 50, before_id: int | None = None) -> Sequence[Sale]:
+    query = db.query(Sale).options(selectinload(Sale.items))
+    return paginate_sales_query(query, skip, limit, before_id).all()
+
+
+def list_sales_by_user(
+    db: Session,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 50,
+    before_id: int | None = None,
+) -> Sequence[Sale]:
+    query = db.query(Sale).options(selectinload(Sale.items)).filter(Sale.user_id == user_id)
+    return paginate_sales_query(query, skip, limit, before_id).all()
+
+
+def iter_sales_for_export(
+    db: Session,
+    *,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    batch_size: int = 1000,
+) -> Iterator[Row]:
+    """
+    Recorre ventas e items como filas planas (una por item, ordenadas por venta),
+    con yield_per para que el driver use un cursor del lado del servidor.
+    """
+    query = (
+        select(
+            Sale.id.label("sale_id"),
+            Sale.date,
+            Sale.user_id,
+            Sale.total_amount,
+            SaleItem.id.label("item_id"),
+            SaleItem.product_id,
+            SaleItem.variant_id,
+            SaleItem.quantity,
+            SaleItem.unit_price,
+        )
+        .outerjoin(SaleItem, SaleItem.sale_id == Sale.id)
+        .order_by(Sale.id, SaleItem.id)
     )
+    if date_from is not None:
+        query = query.where(Sale.date >= date_from)
+    if date_to is not None:
+        query = query.where(Sale.date < date_to)
+    yield from db.execute(query.execution_options(yield_per=batch_size))
 
 
 def get_sale(db: Session, sale_id: int) -> Sale | None:
     return db.query(Sale).options(selectinload(Sale.items)).filter(Sale.id == sale_id).first()
 
 
-def _build_sale_items_and_total(
-    db: Session, items: list[tuple[int, int, Decimal | None]]
-) -> tuple[list[SaleItem], Decimal]:
+SaleLine = tuple[int, int, Decimal | None, int | None]
+
+
+def _build_sale_items_and_total(db: Session, items: list[SaleLine]) -> tuple[list[SaleItem], Decimal]:
     if not items:
         raise ValueError("A sale must include at least one item.")
 
+    product_ids = {product_id for product_id, _, _, _ in items}
+    has_variants = select(ProductVariant.id).where(ProductVariant.product_id == Product.id).exists()
+    prices_by_product_id: dict[int, Decimal] = {}
+    categories_by_product_id: dict[int, int] = {}
+    products_with_variants: set[int] = set()
+    for product_id, price, category_id, with_variants in db.query(
+        Product.id, Product.price, Product.category_id, has_variants
+    ).filter(Product.id.in_(product_ids)):
+        prices_by_product_id[product_id] = price
+        categories_by_product_id[product_id] = category_id
+        if with_variants:
+            products_with_variants.add(product_id)
+    variant_ids = {variant_id for _, _, _, variant_id in items if variant_id is not None}
+    variants_by_id = {
+        variant.id: variant
+        for variant in db.query(
+            ProductVariant.id,
+            ProductVariant.product_id,
+            ProductVariant.price_override,
+            ProductVariant.is_active,
+        ).filter(ProductVariant.id.in_(variant_ids))
+    } if variant_ids else {}
+
     sale_items: list[SaleItem] = []
     total_amount = Decimal("0.00")
-    for product_id, quantity, unit_price in items:
-        product = db.query(Product).filter(Product.id == product_id).first()
-        if not product:
+    for product_id, quantity, unit_price, variant_id in items:
+        if product_id not in prices_by_product_id:
             raise ValueError(f"Product {product_id} not found.")
         if quantity <= 0:
             raise ValueError("Quantity must be greater than 0.")
-        applied_price = unit_price if unit_price is not None else Decimal(str(product.price))
+        list_price = prices_by_product_id[product_id]
+        if variant_id is None and product_id in products_with_variants:
+            # Sin variante no se descuenta stock: se exige para no vender de mas.
+            raise ValueError(f"Product {product_id} has variants; variant_id is required.")
+        if variant_id is not None:
+            variant = variants_by_id.get(variant_id)
+            if not variant or variant.product_id != product_id:
+                raise ValueError(f"Variant {variant_id} not found for product {product_id}.")
+            if not variant.is_active:
+                raise ValueError(f"Variant {variant_id} is not available.")
+            if variant.price_override is not None:
+                list_price = variant.price_override
+        applied_price = catalog.to_money(unit_price if unit_price is not None else Decimal(str(list_price)))
         if applied_price <= 0:
             raise ValueError("Unit price must be greater than 0.")
         total_amount += applied_price * quantity
         sale_items.append(
             SaleItem(
                 product_id=product_id,
+                variant_id=variant_id,
                 quantity=quantity,
                 unit_price=applied_price,
+                category_id=categories_by_product_id[product_id],
             )
         )
     return sale_items, total_amount
 
 
+def _quantities_by_variant(sale_items: list[SaleItem]) -> dict[int, int]:
+    quantities: dict[int, int] = {}
+    for item in sale_items:
+        if item.variant_id is not None:
+            quantities[item.variant_id] = quantities.get(item.variant_id, 0) + item.quantity
+    return quantities
+
+
+def _apply_stock_changes(db: Session, deltas: dict[int, int]) -> tuple[dict[str, int], set[int]]:
+    """
+    Aplica los cambios de stock por variante (positivo = descuenta, negativo = repone).
+    Los descuentos son un UPDATE condicional (stock >= cantidad), asi que nunca se vende
+    de mas. Las variantes se recorren en orden de id para que dos ventas concurrentes
+    bloqueen las filas en el mismo orden y no se produzcan deadlocks.
+    Devuelve el stock resultante por SKU y los productos con alguna variante que se quedo
+    sin stock o volvio a tenerlo (los unicos que pueden entrar o salir de un listado filtrado).
+    """
+    stocks: dict[str, int] = {}
+    crossed_zero: set[int] = set()
+    for variant_id in sorted(deltas):
+        quantity = deltas[variant_id]
+        if quantity == 0:
+            continue
+        statement = update(ProductVariant).where(ProductVariant.id == variant_id)
+        if quantity > 0:
+            statement = statement.where(ProductVariant.stock >= quantity)
+        row = db.execute(
+            statement.values(stock=ProductVariant.stock - quantity)
+            .returning(ProductVariant.sku, ProductVariant.stock, ProductVariant.product_id)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if row is None:
+            if quantity > 0:
+                raise ValueError(f"Insufficient stock for variant {variant_id}.")
+            continue
+        stocks[row.sku] = row.stock
+        if (row.stock > 0) != (row.stock + quantity > 0):
+            crossed_zero.add(row.product_id)
+    return stocks, crossed_zero
+
+
+def _stock_product_ids(*sale_items: list[SaleItem]) -> set[int]:
+    return {item.product_id for group in sale_items for item in group if item.variant_id is not None}
+
+
+def _commit_stock_change(
+    db: Session,
+    product_ids: set[int],
+    stocks: dict[str, int],
+    crossed_zero: set[int],
+) -> None:
+    if product_ids:
+        catalog.bump_product_versions(db, *product_ids)
+    commit_loaded(db)
+    # Las paginas que ya contienen el producto caen por su tag; los listados filtrados solo
+    # cambian de contenido si alguna variante se quedo sin stock o volvio a tenerlo.
+    for product_id in product_ids:
+        invalidate_product(product_id, query_lists=product_id in crossed_zero)
+    sku_stock_index.set_stock(stocks)
+
+
+def _apply_rollup_delta(db: Session, day: date, lines: list[analytics.RollupLine], sales_count: int = 0) -> None:
+    """
+    Suma la venta a los agregados en una transaccion corta, despues de confirmarla. Todas las
+    ventas del dia escriben la misma fila de sales_daily: dentro del checkout se serializaban
+    con las variantes ya bloqueadas. Si falla, la venta queda confirmada y los agregados se
+    corrigen con `python -m app.cli refresh-analytics`.
+    """
+    try:
+        analytics.apply_sale_delta(db, day, lines, sales_count=sales_count)
+        commit_loaded(db)
+    except SQLAlchemyError:
+        db.rollback()
+        logger.exception("Sales rollups for %s not updated; run refresh-analytics to rebuild them.", day)
+
+
 def create_sale(
     db: Session,
     *,
     user_id: int,
-    items: list[tuple[int, int, Decimal | None]],
+    items: list[SaleLine],
+    idempotency_key: str | None = None,
 ) -> Sale:
     sale_items, total_amount = _build_sale_items_and_total(db, items)
+    quantities = _quantities_by_variant(sale_items)
 
+    try:
+        stocks, crossed_zero = _apply_stock_changes(db, quantities)
+    except ValueError:
+        db.rollback()
+        raise
+
+    # La columna es DateTime sin zona: se guarda UTC naive, igual que se lee de la base.
     sale = Sale(
-        date=datetime.now(timezone.utc),
+        date=datetime.now(timezone.utc).replace(tzinfo=None),
         total_amount=total_amount,
         user_id=user_id,
         items=sale_items,
     )
     db.add(sale)
-    db.commit()
-    db.refresh(sale)
-    return get_sale(db, sale.id)  # type: ignore[return-value]
+    if idempotency_key is not None:
+        db.flush()
+        db.execute(
+            update(SaleIdempotencyKey)
+            .where(SaleIdempotencyKey.user_id == user_id, SaleIdempotencyKey.key == idempotency_key)
+            .values(sale_id=sale.id)
+        )
+    _commit_stock_change(db, _stock_product_ids(sale_items), stocks, crossed_zero)
+    _apply_rollup_delta(db, sale.date.date(), analytics.sale_lines(sale_items), sales_count=1)
+    return sale
+
+
+class IdempotencyKeyMismatch(ValueError):
+    """La Idempotency-Key ya se uso con un cuerpo distinto."""
+
+
+def sale_request_hash(items: list[SaleLine]) -> str:
+    lines = [
+        [product_id, quantity, None if unit_price is None else str(catalog.to_money(unit_price)), variant_id]
+        for product_id, quantity, unit_price, variant_id in items
+    ]
+    return hashlib.sha256(json.dumps(lines, separators=(",", ":")).encode()).hexdigest()
+
+
+def create_sale_idempotent(
+    db: Session,
+    *,
+    user_id: int,
+    key: str,
+    items: list[SaleLine],
+) -> tuple[Sale, bool]:
+    """
+    Crea la venta una sola vez por (usuario, key) y devuelve (venta, replay).
+    La key se inserta en la misma transaccion que la venta: un duplicado concurrente queda
+    esperando en el indice unico hasta que la primera termina y despues recibe esa venta.
+    """
+    request_hash = sale_request_hash(items)
+    stored = select(SaleIdempotencyKey.request_hash, SaleIdempotencyKey.sale_id).where(
+        SaleIdempotencyKey.user_id == user_id,
+        SaleIdempotencyKey.key == key,
+    )
+    record = db.execute(stored).first()
+    if record is None:
+        insert = upsert_insert(db)
+        claimed = db.execute(
+            insert(SaleIdempotencyKey)
+            .values(
+                user_id=user_id,
+                key=key,
+                request_hash=request_hash,
+                created_at=datetime.now(timezone.utc).replace(tzinfo=None),
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "key"])
+        )
+        if claimed.rowcount == 1:
+            return create_sale(db, user_id=user_id, items=items, idempotency_key=key), False
+        record = db.execute(stored.with_for_update()).first()
+
+    if record.request_hash != request_hash:
+        raise IdempotencyKeyMismatch("Idempotency-Key was already used with a different request body.")
+    sale = get_sale(db, record.sale_id) if record.sale_id is not None else None
+    if sale is None:
+        raise ValueError("The sale created with this Idempotency-Key no longer exists.")
+    commit_loaded(db)
+    return sale, True
+
+
+def purge_idempotency_keys(db: Session, older_than: datetime, batch_size: int = 1000) -> int:
+    """Borra en lotes las Idempotency-Key creadas antes de older_than."""
+    purged = 0
+    while True:
+        batch = (
+            select(SaleIdempotencyKey.id)
+            .where(SaleIdempotencyKey.created_at < older_than)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        deleted = db.execute(
+            delete(SaleIdempotencyKey)
+            .where(SaleIdempotencyKey.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        purged += deleted
+        if deleted < batch_size:
+            return purged
+
+
+def _lock_sale(db: Session, sale: Sale) -> Sale:
+    """
+    Relee la venta y sus items con la fila de la venta bloqueada (FOR UPDATE). Dos requests
+    sobre la misma venta se serializan y el segundo calcula el stock a devolver con lo que
+    dejo el primero; si la venta ya se borro, falla en vez de reponer dos veces.
+    """
+    locked = (
+        db.query(Sale)
+        .options(selectinload(Sale.items))
+        .filter(Sale.id == sale.id)
+        .with_for_update()
+        .populate_existing()
+        .first()
+    )
+    if locked is None:
+        db.rollback()
+        raise ValueError("Sale not found.")
+    return locked
 
 
 def update_sale(
     db: Session,
     sale: Sale,
     *,
-    items: list[tuple[int, int, Decimal | None]],
+    items: list[SaleLine],
 ) -> Sale:
+    sale = _lock_sale(db, sale)
     sale_items, total_amount = _build_sale_items_and_total(db, items)
+    previous_items = list(sale.items)
+    released = _quantities_by_variant(previous_items)
+    reserved = _quantities_by_variant(sale_items)
+
+    deltas = dict(reserved)
+    for variant_id, quantity in released.items():
+        deltas[variant_id] = deltas.get(variant_id, 0) - quantity
+
+    try:
+        stocks, crossed_zero = _apply_stock_changes(db, deltas)
+    except ValueError:
+        db.rollback()
+        raise
 
     sale.items.clear()
     for item in sale_items:
         sale.items.append(item)
     sale.total_amount = total_amount
+    rollup_lines = analytics.sale_lines(previous_items, sign=-1) + analytics.sale_lines(sale_items)
 
-    db.commit()
-    db.refresh(sale)
-    return get_sale(db, sale.id)  # type: ignore[return-value]
+    _commit_stock_change(db, _stock_product_ids(previous_items, sale_items), stocks, crossed_zero)
+    _apply_rollup_delta(db, sale.date.date(), rollup_lines)
+    return sale
 
 
 def delete_sale(db: Session, sale: Sale) -> None:
+    sale = _lock_sale(db, sale)
+    released = _quantities_by_variant(sale.items)
+    product_ids = _stock_product_ids(sale.items)
+    stocks, crossed_zero = _apply_stock_changes(
+        db, {variant_id: -quantity for variant_id, quantity in released.items()}
+    )
+    day, rollup_lines = sale.date.date(), analytics.sale_lines(sale.items, sign=-1)
     db.delete(sale)
+    _commit_stock_change(db, product_ids, stocks, crossed_zero)
+    _apply_rollup_delta(db, day, rollup_lines, sales_count=-1)
+
+
+def find_sale_total_mismatches(db: Session, limit: int | None = None) -> list[tuple[int, Decimal, Decimal]]:
+    """Devuelve (sale_id, total guardado, suma de items) de las ventas cuyo total no coincide."""
+    items_total = func.coalesce(func.sum(SaleItem.unit_price * SaleItem.quantity), 0)
+    query = (
+        db.query(Sale.id, Sale.total_amount, items_total)
+        .outerjoin(SaleItem, SaleItem.sale_id == Sale.id)
+        .group_by(Sale.id, Sale.total_amount)
+        .having(Sale.total_amount != items_total)
+        .order_by(Sale.id)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return [(sale_id, Decimal(str(stored)), Decimal(str(computed))) for sale_id, stored, computed in query.all()]
+
+
+def items_total_subquery():
+    """SUM(unit_price * quantity) de los items de la venta, correlacionado con sales.id."""
+    return (
+        select(func.coalesce(func.sum(SaleItem.unit_price * SaleItem.quantity), 0))
+        .where(SaleItem.sale_id == Sale.id)
+        .scalar_subquery()
+    )
+
+
+def repair_sale_totals(db: Session, sale_ids: list[int]) -> int:
+    if not sale_ids:
+        return 0
+    result = db.execute(
+        update(Sale)
+        .where(Sale.id.in_(sale_ids))
+        .values(total_amount=items_total_subquery())
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
+    return result.rowcount
@@ -2,8 +2,7 @@ from decimal import Decimal
 
 from sqlalchemy.orm import Session
 
-from app.models.Products import Product
-from app.models.Sale import Sale
+from app.crud.sale import SaleLine, get_sale, update_sale
 from app.models.SaleItem import SaleItem
 
 
@@ -15,15 +14,21 @@ def get_sale_item(db: Session, sale_item_id: int) -> SaleItem | None:
     return db.query(SaleItem).filter(SaleItem.id == sale_item_id).first()
 
 
-def _recalculate_total(db: Session, sale_id: int) -> None:
-    sale = db.query(Sale).filter(Sale.id == sale_id).first()
-    if not sale:
-        return
-    items = db.query(SaleItem).filter(SaleItem.sale_id == sale_id).all()
-    total = Decimal("0.00")
-    for item in items:
-        total += Decimal(str(item.unit_price)) * item.quantity
-    sale.total_amount = total
+def _sale_lines(items: list[SaleItem]) -> list[SaleLine]:
+    # Las lineas existentes conservan el precio cobrado.
+    return [(item.product_id, item.quantity, item.unit_price, item.variant_id) for item in items]
+
+
+def _line_index(items: list[SaleItem], sale_item_id: int) -> int:
+    for index, item in enumerate(items):
+        if item.id == sale_item_id:
+            return index
+    raise ValueError("Sale item not found.")
+
+
+# Las altas, cambios y bajas de items pasan por update_sale: stock, total y agregados
+# se actualizan igual que al editar la venta completa. update_sale recrea los items,
+# asi que el item devuelto tiene un id nuevo.
 
 
 def create_sale_item(
@@ -33,33 +38,14 @@ def create_sale_item(
     product_id: int,
     quantity: int,
     unit_price: Decimal | None = None,
+    variant_id: int | None = None,
 ) -> SaleItem:
-    sale = db.query(Sale).filter(Sale.id == sale_id).first()
+    sale = get_sale(db, sale_id)
     if not sale:
         raise ValueError("Sale not found.")
-
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
-        raise ValueError("Product not found.")
-    if quantity <= 0:
-        raise ValueError("Quantity must be greater than 0.")
-
-    final_price = unit_price if unit_price is not None else Decimal(str(product.price))
-    if final_price <= 0:
-        raise ValueError("Unit price must be greater than 0.")
-
-    sale_item = SaleItem(
-        sale_id=sale_id,
-        product_id=product_id,
-        quantity=quantity,
-        unit_price=final_price,
-    )
-    db.add(sale_item)
-    db.flush()
-    _recalculate_total(db, sale_id)
-    db.commit()
-    db.refresh(sale_item)
-    return sale_item
+    lines = _sale_lines(sale.items) + [(product_id, quantity, unit_price, variant_id)]
+    sale = update_sale(db, sale, items=lines)
+    return sale.items[-1]
 
 
 def update_sale_item(
@@ -69,32 +55,31 @@ def update_sale_item(
     product_id: int | None = None,
     quantity: int | None = None,
     unit_price: Decimal | None = None,
+    variant_id: int | None = None,
 ) -> SaleItem:
-    if product_id is not None:
-        product = db.query(Product).filter(Product.id == product_id).first()
-        if not product:
-            raise ValueError("Product not found.")
-        sale_item.product_id = product_id
-
-    if quantity is not None:
-        if quantity <= 0:
-            raise ValueError("Quantity must be greater than 0.")
-        sale_item.quantity = quantity
-
-    if unit_price is not None:
-        if unit_price <= 0:
-            raise ValueError("Unit price must be greater than 0.")
-        sale_item.unit_price = unit_price
-
-    _recalculate_total(db, sale_item.sale_id)
-    db.commit()
-    db.refresh(sale_item)
-    return sale_item
+    sale = get_sale(db, sale_item.sale_id)
+    if not sale:
+        raise ValueError("Sale not found.")
+    lines = _sale_lines(sale.items)
+    index = _line_index(sale.items, sale_item.id)
+    current_product_id, current_quantity, current_price, current_variant_id = lines[index]
+    if variant_id is None and product_id not in (None, current_product_id):
+        # La variante anterior es de otro producto.
+        current_variant_id = None
+    lines[index] = (
+        product_id if product_id is not None else current_product_id,
+        quantity if quantity is not None else current_quantity,
+        unit_price if unit_price is not None else current_price,
+        variant_id if variant_id is not None else current_variant_id,
+    )
+    sale = update_sale(db, sale, items=lines)
+    return sale.items[index]
 
 
 def delete_sale_item(db: Session, sale_item: SaleItem) -> None:
-    sale_id = sale_item.sale_id
-    db.delete(sale_item)
-    db.flush()
-    _recalculate_total(db, sale_id)
-    db.commit()
+    sale = get_sale(db, sale_item.sale_id)
+    if not sale:
+        raise ValueError("Sale not found.")
+    lines = _sale_lines(sale.items)
+    del lines[_line_index(sale.items, sale_item.id)]
+    update_sale(db, sale, items=lines)
@@ -0,0 +1,161 @@
+import threading
+import time
+from collections.abc import Iterable
+from decimal import Decimal
+from typing import NamedTuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.Products import Product
+from app.models.productVariant import ProductVariant
+
+
+class SkuStock(NamedTuple):
+    sku: str
+    variant_id: int
+    product_id: int
+    stock: int
+    # price_override de la variante o, si no tiene, el precio del producto.
+    price: Decimal
+    # Variante y producto activos (lo que se puede vender).
+    is_active: bool
+
+
+def _stock_query():
+    return select(
+        ProductVariant.sku,
+        ProductVariant.id,
+        ProductVariant.product_id,
+        ProductVariant.stock,
+        func.coalesce(ProductVariant.price_override, Product.price),
+        ProductVariant.is_active,
+        Product.is_active,
+    ).join(Product, Product.id == ProductVariant.product_id)
+
+
+def _to_entry(row) -> SkuStock:
+    sku, variant_id, product_id, stock, price, variant_active, product_active = row
+    return SkuStock(sku, variant_id, product_id, stock, Decimal(str(price)), bool(variant_active and product_active))
+
+
+def load_sku_stock(db: Session, skus: Iterable[str], chunk_size: int = 500) -> dict[str, SkuStock]:
+    skus = list(skus)
+    found: dict[str, SkuStock] = {}
+    for start in range(0, len(skus), chunk_size):
+        rows = db.execute(_stock_query().where(ProductVariant.sku.in_(skus[start:start + chunk_size])))
+        for row in rows:
+            entry = _to_entry(row)
+            found[entry.sku] = entry
+    return found
+
+
+class SkuStockIndex:
+    """
+    Indice en memoria sku -> SkuStock para las consultas de stock por SKU.
+    Se carga entero en el startup; las escrituras de este proceso lo actualizan o descartan
+    las entradas afectadas despues del commit. Por defecto las entradas no vencen; con
+    ttl_seconds las escrituras de fuera de la app se ven al vencer la entrada. Un SKU que
+    no esta (o vencio) se lee de la base y se agrega.
+    """
+
+    def __init__(self, ttl_seconds: float = 0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[SkuStock, float]] = {}
+        self._product_skus: dict[int, set[str]] = {}
+        # Cuenta las escrituras: una lectura de la base que se cruzo con una escritura no se guarda.
+        self._writes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._product_skus.clear()
+            self._writes += 1
+
+    def build(self, db: Session, batch_size: int = 5000) -> int:
+        loaded_at = time.monotonic()
+        with self._lock:
+            self._entries.clear()
+            self._product_skus.clear()
+            for row in db.execute(_stock_query().execution_options(yield_per=batch_size)):
+                self._store(_to_entry(row), loaded_at)
+            return len(self._entries)
+
+    def lookup(self, db: Session, skus: Iterable[str]) -> dict[str, SkuStock]:
+        now = time.monotonic()
+        found: dict[str, SkuStock] = {}
+        misses: list[str] = []
+        for sku in skus:
+            cached = self._entries.get(sku)
+            if cached is not None and (not self.ttl_seconds or now - cached[1] < self.ttl_seconds):
+                found[sku] = cached[0]
+            else:
+                misses.append(sku)
+        if misses:
+            writes = self._writes
+            loaded = load_sku_stock(db, misses)
+            found.update(loaded)
+            with self._lock:
+                if writes == self._writes:
+                    for sku in misses:
+                        if sku in loaded:
+                            self._store(loaded[sku], now)
+                        else:
+                            self._remove(sku)
+        return found
+
+    def put(self, entry: SkuStock) -> None:
+        with self._lock:
+            self._writes += 1
+            self._remove(entry.sku)
+            self._store(entry, time.monotonic())
+
+    def set_stock(self, stocks: dict[str, int]) -> None:
+        """Actualiza el stock de las entradas cargadas (valores leidos con RETURNING)."""
+        with self._lock:
+            self._writes += 1
+            for sku, stock in stocks.items():
+                cached = self._entries.get(sku)
+                if cached is not None:
+                    self._entries[sku] = (cached[0]._replace(stock=stock), cached[1])
+
+    def discard(self, *skus: str) -> None:
+        with self._lock:
+            self._writes += 1
+            for sku in skus:
+                self._remove(sku)
+
+    def discard_products(self, *product_ids: int) -> None:
+        with self._lock:
+            self._writes += 1
+            for product_id in product_ids:
+                for sku in list(self._product_skus.get(product_id, ())):
+                    self._remove(sku)
+
+    def _store(self, entry: SkuStock, loaded_at: float) -> None:
+        self._entries[entry.sku] = (entry, loaded_at)
+        self._product_skus.setdefault(entry.product_id, set()).add(entry.sku)
+
+    def _remove(self, sku: str) -> None:
+        cached = self._entries.pop(sku, None)
+        if cached is None:
+            return
+        skus = self._product_skus.get(cached[0].product_id)
+        if skus is not None:
+            skus.discard(sku)
+            if not skus:
+                del self._product_skus[cached[0].product_id]
+
+
+sku_stock_index = SkuStockIndex(ttl_seconds=settings.SKU_INDEX_TTL_SECONDS)
+
+
+def lookup_skus(db: Session, skus: Iterable[str]) -> dict[str, SkuStock]:
+    if not settings.SKU_INDEX_ENABLED:
+        return load_sku_stock(db, skus)
+    return sku_stock_index.lookup(db, skus)
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 
+from app.core.cache import invalidate_user
 from app.models.User import User
 
 
@@ -15,8 +16,14 @@ def get_user_by_username(db: Session, username: str) -> User | None:
     return db.query(User).filter(User.username == username).first()
 
 
-def list_users(db: Session, skip: int = 0, limit: int = 50) -> list[User]:
-    return db.query(User).offset(skip).limit(limit).all()
+def list_users(db: Session, skip: int = 0, limit: int = 50, after_id: int | None = None) -> list[User]:
+    query = db.query(User)
+    query = query.order_by(User.id)
+    if after_id is not None:
+        query = query.filter(User.id > after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 
 def create_user(
@@ -58,9 +65,12 @@ def update_user(
         user.role = role
     db.commit()
     db.refresh(user)
+    invalidate_user(user.id)
     return user
 
 
 def delete_user(db: Session, user: User) -> None:
+    user_id = user.id
     db.delete(user)
     db.commit()
+    invalidate_user(user_id)
@@ -1,7 +1,33 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from app.core.db import Base, engine
-from app.models import Category, Product, ProductImage, ProductVariant, Sale, SaleItem, User  # noqa: F401
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.db import Base, SessionLocal, async_engine, engine
+from app.core.deps import require_metrics_access
+from app.core.health import ReadinessCheck
+from app.core.http_metrics import RequestMetricsMiddleware, track_threadpool
+from app.core.metrics import CONTENT_TYPE_LATEST, render_latest
+from app.core.security import PasswordHasherBusy, shutdown_password_executor
+from app.core.sql_stats import SQLStatsMiddleware
+from app.crud.sku_stock import sku_stock_index
+from app.models import (  # noqa: F401
+    Category,
+    Product,
+    ProductImage,
+    ProductVariant,
+    Sale,
+    SaleIdempotencyKey,
+    SaleItem,
+    SalesDaily,
+    SalesDailyCategory,
+    SalesDailyProduct,
+    User,
+)
+from app.router.analytics import router as analytics_router
+from app.router.async_auth import router as async_auth_router
+from app.router.async_catalog import router as async_catalog_router
+from app.router.async_sales import router as async_sales_router
 from app.router.auth import router as auth_router
 from app.router.catalog import router as catalog_router
 from app.router.categories import router as categories_router
@@ -10,11 +36,42 @@ from app.router.users import router as users_router
 
 app = FastAPI(title="Tienda de Ropa API")
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+if settings.SQL_STATS_ENABLED:
+    app.add_middleware(
+        SQLStatsMiddleware,
+        server_timing=settings.SQL_SERVER_TIMING_ENABLED,
+        debug_headers=settings.DEBUG,
+        n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+    )
+if settings.HTTP_METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
+readiness = ReadinessCheck(engine, ttl_seconds=settings.HEALTH_READY_CACHE_SECONDS)
+
+# Con ASYNC_DB_ENABLED, las rutas async de lectura se registran primero y tienen prioridad
+# sobre las sync con el mismo path; el resto de las rutas sigue usando la sesion sync.
+if settings.ASYNC_DB_ENABLED:
+    app.include_router(async_auth_router)
+    app.include_router(async_catalog_router)
+    app.include_router(async_sales_router)
+
 app.include_router(auth_router)
 app.include_router(catalog_router)
 app.include_router(categories_router)
 app.include_router(users_router)
 app.include_router(sales_router)
+app.include_router(analytics_router)
+
+
+@app.exception_handler(PasswordHasherBusy)
+def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Authentication service is busy, retry shortly."},
+        headers={"Retry-After": str(settings.PASSWORD_HASHER_RETRY_AFTER_SECONDS)},
+    )
 
 
 @app.get("/health", tags=["Health"])
@@ -22,6 +79,38 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/health/ready", tags=["Health"])
+def readiness_check():
+    ready, error = readiness.check()
+    if not ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "database": error},
+        )
+    return {"status": "ready", "database": "ok"}
+
+
+@app.get(
+    "/metrics",
+    tags=["Health"],
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_metrics_access)],
+)
+def metrics():
+    return PlainTextResponse(render_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.on_event("startup")
 def on_startup() -> None:
     Base.metadata.create_all(bind=engine)
+    track_threadpool()
+    if settings.SKU_INDEX_ENABLED:
+        with SessionLocal() as db:
+            sku_stock_index.build(db)
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    shutdown_password_executor()
+    if async_engine is not None:
+        await async_engine.dispose()
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, Numeric, String
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, Numeric, String
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -6,6 +6,14 @@ from app.core.db import Base
 
 class Product(Base):
     __tablename__ = "products"
+    # Listado filtrado/ordenado con paginacion keyset sobre (clave de orden, id).
+    __table_args__ = (
+        Index("ix_products_active_id", "is_active", "id"),
+        Index("ix_products_active_category_id", "is_active", "category_id", "id"),
+        Index("ix_products_active_min_price_id", "is_active", "min_price", "id"),
+        Index("ix_products_active_total_stock", "is_active", "total_stock"),
+        Index("ix_products_active_name_id", "is_active", "name", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)
@@ -13,6 +21,14 @@ class Product(Base):
     price = Column(Numeric(10, 2), nullable=False)
     is_active = Column(Boolean, nullable=False, default=True)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    # Se incrementa ante cualquier cambio del producto, sus variantes o sus imagenes (ETag).
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Resumen de variantes activas, recalculado en cada bump de version (app/crud/catalog.py).
+    min_price = Column(Numeric(10, 2), nullable=True)
+    max_price = Column(Numeric(10, 2), nullable=True)
+    total_stock = Column(Integer, nullable=False, default=0, server_default="0")
+    active_variant_count = Column(Integer, nullable=False, default=0, server_default="0")
+    primary_image_url = Column(String, nullable=True)
 
     items = relationship("SaleItem", back_populates="product")
     sales = relationship(
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, UniqueConstraint
+
+from app.core.db import Base
+
+
+class SaleIdempotencyKey(Base):
+    """Idempotency-Key de POST /sales: la venta creada con cada (usuario, key) y el hash del cuerpo."""
+
+    __tablename__ = "sale_idempotency_keys"
+    __table_args__ = (UniqueConstraint("user_id", "key", name="uq_sale_idempotency_keys_user_key"),)
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    sale_id = Column(Integer, ForeignKey("sales.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime, nullable=False, index=True)
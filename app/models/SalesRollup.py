@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer, Numeric
+
+from app.core.db import Base
+
+# Agregados diarios de ventas. Se mantienen de forma incremental desde app/crud/sale.py
+# y se pueden reconstruir con `python -m app.cli refresh-analytics`.
+
+
+class SalesDaily(Base):
+    __tablename__ = "sales_daily"
+
+    day = Column(Date, primary_key=True)
+    sales_count = Column(Integer, nullable=False, default=0)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+
+
+class SalesDailyProduct(Base):
+    __tablename__ = "sales_daily_products"
+
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True, index=True)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+
+
+class SalesDailyCategory(Base):
+    __tablename__ = "sales_daily_categories"
+
+    day = Column(Date, primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True, index=True)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
@@ -3,7 +3,9 @@ from app.models.productImage import ProductImage
 from app.models.Products import Product
 from app.models.productVariant import ProductVariant
 from app.models.Sale import Sale
+from app.models.SaleIdempotencyKey import SaleIdempotencyKey
 from app.models.SaleItem import SaleItem
+from app.models.SalesRollup import SalesDaily, SalesDailyCategory, SalesDailyProduct
 from app.models.User import User
 
 __all__ = [
@@ -13,5 +15,9 @@ __all__ = [
     "ProductImage",
     "Sale",
     "SaleItem",
+    "SaleIdempotencyKey",
+    "SalesDaily",
+    "SalesDailyProduct",
+    "SalesDailyCategory",
     "User",
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, Numeric, String
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, Numeric, String
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -6,6 +6,7 @@ from app.core.db import Base
 
 class ProductVariant(Base):
     __tablename__ = "product_variants"
+    __table_args__ = (Index("ix_product_variants_product_active_stock", "product_id", "is_active", "stock"),)
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
@@ -1,7 +1,19 @@
+from app.router.async_auth import router as async_auth_router
+from app.router.async_catalog import router as async_catalog_router
+from app.router.async_sales import router as async_sales_router
 from app.router.auth import router as auth_router
 from app.router.categories import router as categories_router
 from app.router.catalog import router as catalog_router
 from app.router.sales import router as sales_router
 from app.router.users import router as users_router
 
-__all__ = ["auth_router", "catalog_router", "categories_router", "users_router", "sales_router"]
+__all__ = [
+    "async_auth_router",
+    "async_catalog_router",
+    "async_sales_router",
+    "auth_router",
+    "catalog_router",
+    "categories_router",
+    "users_router",
+    "sales_router",
+]
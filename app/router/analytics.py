@@ -0,0 +1,45 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.db import get_db
+from app.core.deps import require_admin
+from app.crud import analytics as analytics_crud
+from app.schemas.analytics import BasketSummaryRead, CategorySalesRead, DailyRevenueRead, ProductSalesRead
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"], dependencies=[Depends(require_admin)])
+
+
+def date_range(date_from: date | None = None, date_to: date | None = None) -> tuple[date | None, date | None]:
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from must not be after date_to.")
+    return date_from, date_to
+
+
+@router.get("/revenue", response_model=list[DailyRevenueRead])
+def revenue_by_day(days: tuple = Depends(date_range), db: Session = Depends(get_db)):
+    return analytics_crud.revenue_by_day(db, *days)
+
+
+@router.get("/products", response_model=list[ProductSalesRead])
+def units_by_product(
+    days: tuple = Depends(date_range),
+    limit: int = Query(default=50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    return analytics_crud.units_by_product(db, *days, limit=limit)
+
+
+@router.get("/categories", response_model=list[CategorySalesRead])
+def top_categories(
+    days: tuple = Depends(date_range),
+    limit: int = Query(default=10, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    return analytics_crud.top_categories(db, *days, limit=limit)
+
+
+@router.get("/basket", response_model=BasketSummaryRead)
+def basket_summary(days: tuple = Depends(date_range), db: Session = Depends(get_db)):
+    return analytics_crud.basket_summary(db, *days)
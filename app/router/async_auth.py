@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.db import get_async_db
+from app.core.deps import get_current_user_async
+from app.core.security import (
+    PasswordHasherBusy,
+    create_access_token,
+    hash_password_async,
+    password_needs_rehash,
+    record_rehash,
+    verify_password_async,
+)
+from app.crud import async_user
+from app.schemas.auth import LoginRequest, TokenResponse
+from app.schemas.user import UserRead
+
+router = APIRouter(prefix="/auth", tags=["Auth"])
+
+
+@router.post("/login", response_model=TokenResponse)
+async def login(payload: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    user = await async_user.get_user_by_email(db, payload.email)
+    if not user or not await verify_password_async(payload.password, user.hashed_password):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials.")
+    if password_needs_rehash(user.hashed_password):
+        old_hash = user.hashed_password
+        try:
+            await async_user.update_password_hash(db, user, await hash_password_async(payload.password))
+            record_rehash(old_hash)
+        except PasswordHasherBusy:
+            pass
+    token = create_access_token(
+        data={"sub": str(user.id), "role": user.role},
+        secret_key=settings.SECRET_KEY,
+        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+    )
+    return TokenResponse(access_token=token)
+
+
+@router.get("/me", response_model=UserRead)
+async def read_me(current_user=Depends(get_current_user_async)):
+    return current_user
@@ -0,0 +1,100 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import product_tag
+from app.core.db import get_async_db
+from app.core.etag import etag_matches, not_modified, product_etag, product_list_etag
+from app.crud import async_catalog
+from app.crud.catalog import ProductFilters
+from app.router.catalog import (
+    PRODUCT_LIST_VIEW_PATTERN,
+    build_product_list_response,
+    build_product_response,
+    get_cached_response,
+    json_response,
+    product_detail_cache_key,
+    product_list_after,
+    product_list_cache_key,
+    product_list_filters,
+    product_list_tags,
+    store_cached_response,
+)
+from app.schemas.catalog import ProductRead, ProductSummaryRead
+
+router = APIRouter(prefix="/catalog", tags=["Catalog"])
+
+
+@router.get("/products", response_model=list[ProductRead] | list[ProductSummaryRead])
+async def list_products(
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
+    only_active: bool = True,
+    view: str = Query(default="full", pattern=PRODUCT_LIST_VIEW_PATTERN),
+    filters: ProductFilters = Depends(product_list_filters),
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    after_id, after_key = product_list_after(cursor, filters)
+    cache_key = product_list_cache_key(
+        only_active=only_active,
+        limit=limit,
+        skip=skip,
+        after_id=after_id,
+        filters=filters,
+        after_key=after_key,
+        view=view,
+    )
+    cached = get_cached_response(cache_key)
+    if cached is None:
+        if if_none_match:
+            versions = await async_catalog.list_product_versions(
+                db,
+                skip=skip,
+                limit=limit,
+                only_active=only_active,
+                after_id=after_id,
+                filters=filters,
+                after_key=after_key,
+            )
+            etag = product_list_etag(versions, view)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag, if_none_match)
+
+        list_page = async_catalog.list_product_summaries if view == "summary" else async_catalog.list_products
+        products = await list_page(
+            db,
+            skip=skip,
+            limit=limit,
+            only_active=only_active,
+            after_id=after_id,
+            filters=filters,
+            after_key=after_key,
+        )
+        cached = build_product_list_response(products, limit, filters, view)
+        store_cached_response(cache_key, cached, product_list_tags(products, filters))
+    return json_response(cached, if_none_match, accept_encoding)
+
+
+@router.get("/products/{product_id:int}", response_model=ProductRead)
+async def get_product(
+    product_id: int,
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    cache_key = product_detail_cache_key(product_id)
+    cached = get_cached_response(cache_key)
+    if cached is None:
+        if if_none_match:
+            version = await async_catalog.get_product_version(db, product_id)
+            if version is not None and etag_matches(if_none_match, product_etag(product_id, version)):
+                return not_modified(product_etag(product_id, version), if_none_match)
+
+        product = await async_catalog.get_product(db, product_id)
+        if not product:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found.")
+        cached = build_product_response(product)
+        store_cached_response(cache_key, cached, [product_tag(product_id)])
+    return json_response(cached, if_none_match, accept_encoding)
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_async_db
+from app.core.deps import get_current_principal_async, require_admin_async
+from app.core.pagination import cursor_id, next_cursor_headers
+from app.core.responses import adapter_response
+from app.crud import async_sale
+from app.schemas.sale import SaleRead, sale_list_adapter, sale_read_adapter
+
+router = APIRouter(prefix="/sales", tags=["Sales"])
+
+
+@router.get("/me", response_model=list[SaleRead])
+async def list_my_sales(
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_principal_async),
+):
+    sales = await async_sale.list_sales_by_user(
+        db,
+        current_user.id,
+        skip=skip,
+        limit=limit,
+        before_id=cursor_id(cursor),
+    )
+    return adapter_response(sale_list_adapter, sales, headers=next_cursor_headers(sales, limit))
+
+
+@router.get("", response_model=list[SaleRead], dependencies=[Depends(require_admin_async)])
+async def list_all_sales(
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    sales = await async_sale.list_sales(db, skip=skip, limit=limit, before_id=cursor_id(cursor))
+    return adapter_response(sale_list_adapter, sales, headers=next_cursor_headers(sales, limit))
+
+
+@router.get("/{sale_id:int}", response_model=SaleRead)
+async def get_sale(
+    sale_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_principal_async),
+):
+    sale = await async_sale.get_sale(db, sale_id)
+    if not sale:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sale not found.")
+
+    if current_user.role != "admin" and sale.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions.")
+    return adapter_response(sale_read_adapter, sale)
@@ -4,8 +4,15 @@ from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.core.db import get_db
 from app.core.deps import get_current_user, require_admin
-from app.core.security import create_access_token, hash_password, verify_password
-from app.crud.user import create_user, get_user_by_email, get_user_by_username
+from app.core.security import (
+    PasswordHasherBusy,
+    create_access_token,
+    hash_password,
+    password_needs_rehash,
+    record_rehash,
+    verify_password,
+)
+from app.crud.user import create_user, get_user_by_email, get_user_by_username, update_user
 from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
 from app.schemas.user import UserRead
 
@@ -47,6 +54,14 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
     user = get_user_by_email(db, payload.email)
     if not user or not verify_password(payload.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials.")
+    if password_needs_rehash(user.hashed_password):
+        old_hash = user.hashed_password
+        try:
+            # Lleva el hash al BCRYPT_ROUNDS configurado; si el pool esta saturado se reintenta en otro login.
+            update_user(db, user, hashed_password=hash_password(payload.password))
+            record_rehash(old_hash)
+        except PasswordHasherBusy:
+            pass
     token = create_access_token(
         data={"sub": str(user.id), "role": user.role},
         secret_key=settings.SECRET_KEY,
@@ -1,40 +1,312 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import io
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Response, UploadFile, status
 from sqlalchemy.orm import Session
 
+from app.core.cache import PRODUCT_LIST_TAG, PRODUCT_QUERY_LIST_TAG, CachedResponse, get_catalog_cache, product_tag
+from app.core.compression import available_encodings, compress, negotiate_encoding
+from app.core.config import settings
 from app.core.db import get_db
 from app.core.deps import require_admin
+from app.core.etag import encoded_etag, etag_matches, not_modified, product_etag, product_list_etag
+from app.core.pagination import cursor_values, next_cursor_headers
+from app.core.responses import FastJSONResponse, adapter_response
 from app.crud import catalog as catalog_crud
+from app.crud import catalog_import, catalog_search, sku_stock
 from app.schemas.catalog import (
+    CatalogImportReport,
     ProductCreate,
     ProductImageCreate,
     ProductImageRead,
     ProductImageUpdate,
     ProductRead,
+    ProductSearchResponse,
+    ProductSummaryRead,
     ProductUpdate,
     ProductVariantCreate,
     ProductVariantRead,
     ProductVariantUpdate,
+    SkuLookupRequest,
+    SkuLookupResponse,
+    SkuStockRead,
+    product_list_adapter,
+    product_read_adapter,
+    product_summary_list_adapter,
+    sku_lookup_adapter,
+    sku_stock_adapter,
 )
 
 router = APIRouter(prefix="/catalog", tags=["Catalog"])
 
+PRODUCT_LIST_VIEW_PATTERN = "^(full|summary)$"
+
+
+def product_list_filters(
+    category_id: int | None = Query(default=None, gt=0),
+    min_price: Decimal | None = Query(default=None, ge=0),
+    max_price: Decimal | None = Query(default=None, ge=0),
+    size: str | None = Query(default=None, min_length=1),
+    color: str | None = Query(default=None, min_length=1),
+    in_stock: bool = False,
+    sort: str = Query(default="id", pattern="^(id|newest|price|-price|name)$"),
+) -> catalog_crud.ProductFilters:
+    return catalog_crud.ProductFilters(
+        category_id=category_id,
+        min_price=min_price,
+        max_price=max_price,
+        size=size,
+        color=color,
+        in_stock=in_stock,
+        sort=sort,
+    )
+
+
+def product_list_after(cursor: str | None, filters: catalog_crud.ProductFilters) -> tuple[int | None, object]:
+    """Devuelve (after_id, after_key) del cursor; el cursor tiene que ser del mismo orden."""
+    values = cursor_values(cursor)
+    if values is None:
+        return None, None
+    try:
+        after_id = int(values["id"])
+        # Los cursores sin "sort" son los de antes, que solo se armaban con sort=id.
+        if values.get("sort", "id") != filters.sort:
+            raise ValueError("Cursor sort mismatch.")
+        if filters.sort_column is None:
+            return after_id, None
+        key = values["key"]
+        return after_id, Decimal(key) if filters.sort_column == "min_price" else str(key)
+    except (KeyError, TypeError, ArithmeticError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.") from exc
+
+
+def product_list_cache_key(
+    *,
+    only_active: bool,
+    limit: int,
+    skip: int,
+    after_id: int | None,
+    filters: catalog_crud.ProductFilters = catalog_crud.NO_PRODUCT_FILTERS,
+    after_key: object = None,
+    view: str = "full",
+) -> str:
+    key = f"catalog:products:list:{only_active}:{limit}:{skip}:{after_id}"
+    if view != "full":
+        key = f"{key}:{view}"
+    if filters.is_default:
+        return key
+    return (
+        f"{key}:{filters.category_id}:{filters.min_price}:{filters.max_price}:{filters.size!r}:{filters.color!r}"
+        f":{filters.in_stock}:{filters.sort}:{after_key!r}"
+    )
+
+
+def product_list_tags(products, filters: catalog_crud.ProductFilters) -> list[str]:
+    tags = [PRODUCT_LIST_TAG, *(product_tag(p.id) for p in products)]
+    if not filters.is_default:
+        tags.append(PRODUCT_QUERY_LIST_TAG)
+    return tags
+
+
+def product_detail_cache_key(product_id: int) -> str:
+    return f"catalog:products:detail:{product_id}"
+
+
+def get_cached_response(cache_key: str) -> CachedResponse | None:
+    if not settings.CATALOG_CACHE_ENABLED:
+        return None
+    return get_catalog_cache().get(cache_key)
+
+
+def store_cached_response(cache_key: str, cached: CachedResponse, tags: list[str]) -> None:
+    if settings.CATALOG_CACHE_ENABLED:
+        get_catalog_cache().set(cache_key, cached, tags=tags)
+
+
+def cached_json(body: bytes, headers: dict[str, str]) -> CachedResponse:
+    """
+    Arma la entrada del cache con el cuerpo ya comprimido en cada codificacion. Se comprime
+    antes de guardarla: un cache compartido (Redis) guarda una copia y no veria cambios posteriores.
+    """
+    encoded = {}
+    if settings.COMPRESSION_ENABLED and len(body) >= settings.COMPRESSION_MINIMUM_SIZE:
+        encoded = {encoding: compress(body, encoding) for encoding in available_encodings()}
+    return CachedResponse(body=body, headers=headers, encoded=encoded)
+
+
+def build_product_list_response(
+    products,
+    limit: int,
+    filters: catalog_crud.ProductFilters = catalog_crud.NO_PRODUCT_FILTERS,
+    view: str = "full",
+) -> CachedResponse:
+    adapter = product_summary_list_adapter if view == "summary" else product_list_adapter
+    return cached_json(
+        adapter.dump_json(adapter.validate_python(products, from_attributes=True)),
+        {
+            "ETag": product_list_etag(((p.id, p.version) for p in products), view),
+            **next_cursor_headers(products, limit, filters.cursor_values),
+        },
+    )
+
+
+def build_product_response(product) -> CachedResponse:
+    return cached_json(
+        product_read_adapter.dump_json(product_read_adapter.validate_python(product, from_attributes=True)),
+        {"ETag": product_etag(product.id, product.version)},
+    )
+
+
+def json_response(
+    cached: CachedResponse,
+    if_none_match: str | None = None,
+    accept_encoding: str | None = None,
+) -> Response:
+    etag = cached.headers.get("ETag")
+    if etag and etag_matches(if_none_match, etag):
+        return not_modified(etag, if_none_match)
+    if not settings.COMPRESSION_ENABLED or len(cached.body) < settings.COMPRESSION_MINIMUM_SIZE:
+        return Response(content=cached.body, media_type="application/json", headers=cached.headers)
+
+    headers = {**cached.headers, "Vary": "Accept-Encoding"}
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return Response(content=cached.body, media_type="application/json", headers=headers)
+    # La entrada del cache ya trae el cuerpo comprimido: no se recomprime en cada hit.
+    body = cached.encoded.get(encoding)
+    if body is None:
+        body = compress(cached.body, encoding)
+    headers = {**headers, "Content-Encoding": encoding}
+    if etag:
+        headers["ETag"] = encoded_etag(etag, encoding)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
-@router.get("/products", response_model=list[ProductRead])
+@router.get("/products", response_model=list[ProductRead] | list[ProductSummaryRead])
 def list_products(
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
     only_active: bool = True,
+    view: str = Query(default="full", pattern=PRODUCT_LIST_VIEW_PATTERN),
+    filters: catalog_crud.ProductFilters = Depends(product_list_filters),
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
     db: Session = Depends(get_db),
 ):
-    return catalog_crud.list_products(db, skip=skip, limit=limit, only_active=only_active)
+    after_id, after_key = product_list_after(cursor, filters)
+    cache_key = product_list_cache_key(
+        only_active=only_active,
+        limit=limit,
+        skip=skip,
+        after_id=after_id,
+        filters=filters,
+        after_key=after_key,
+        view=view,
+    )
+    cached = get_cached_response(cache_key)
+    if cached is None:
+        if if_none_match:
+            versions = catalog_crud.list_product_versions(
+                db,
+                skip=skip,
+                limit=limit,
+                only_active=only_active,
+                after_id=after_id,
+                filters=filters,
+                after_key=after_key,
+            )
+            etag = product_list_etag(versions, view)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag, if_none_match)
+
+        list_page = catalog_crud.list_product_summaries if view == "summary" else catalog_crud.list_products
+        products = list_page(
+            db,
+            skip=skip,
+            limit=limit,
+            only_active=only_active,
+            after_id=after_id,
+            filters=filters,
+            after_key=after_key,
+        )
+        cached = build_product_list_response(products, limit, filters, view)
+        store_cached_response(cache_key, cached, product_list_tags(products, filters))
+    return json_response(cached, if_none_match, accept_encoding)
+
+
+@router.get("/search", response_model=ProductSearchResponse)
+def search_products(
+    q: str | None = Query(default=None, max_length=200),
+    category_id: list[int] = Query(default=[]),
+    size: list[str] = Query(default=[]),
+    color: list[str] = Query(default=[]),
+    min_price: Decimal | None = Query(default=None, ge=0),
+    max_price: Decimal | None = Query(default=None, ge=0),
+    in_stock: bool = False,
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    filters = catalog_search.SearchFilters(
+        category_ids=tuple(category_id),
+        sizes=tuple(size),
+        colors=tuple(color),
+        min_price=min_price,
+        max_price=max_price,
+        in_stock=in_stock,
+    )
+    total, products, facets = catalog_search.search_products(db, q, filters, skip=skip, limit=limit)
+    return {"total": total, "items": products, "facets": facets}
+
+
+@router.get("/skus/{sku}", response_model=SkuStockRead)
+def get_sku_stock(sku: str, db: Session = Depends(get_db)):
+    entry = sku_stock.lookup_skus(db, [sku]).get(sku)
+    if entry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="SKU not found.")
+    return adapter_response(sku_stock_adapter, entry)
+
+
+@router.post("/skus:lookup", response_model=SkuLookupResponse)
+def lookup_sku_stock(payload: SkuLookupRequest, db: Session = Depends(get_db)):
+    skus = list(dict.fromkeys(payload.skus))
+    found = sku_stock.lookup_skus(db, skus)
+    return adapter_response(
+        sku_lookup_adapter,
+        {
+            "items": [found[sku] for sku in skus if sku in found],
+            "missing": [sku for sku in skus if sku not in found],
+        },
+    )
 
 
 @router.get("/products/{product_id}", response_model=ProductRead)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    product = catalog_crud.get_product(db, product_id)
-    if not product:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found.")
-    return product
+def get_product(
+    product_id: int,
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    cache_key = product_detail_cache_key(product_id)
+    cached = get_cached_response(cache_key)
+    if cached is None:
+        if if_none_match:
+            version = catalog_crud.get_product_version(db, product_id)
+            if version is not None and etag_matches(if_none_match, product_etag(product_id, version)):
+                return not_modified(product_etag(product_id, version), if_none_match)
+
+        product = catalog_crud.get_product(db, product_id)
+        if not product:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found.")
+        cached = build_product_response(product)
+        store_cached_response(cache_key, cached, [product_tag(product_id)])
+    return json_response(cached, if_none_match, accept_encoding)
+
+
+@router.get("/cache/stats", dependencies=[Depends(require_admin)], response_class=FastJSONResponse)
+def catalog_cache_stats():
+    return get_catalog_cache().stats()
 
 
 @router.post(
@@ -52,7 +324,7 @@ def create_product(payload: ProductCreate, db: Session = Depends(get_db)):
         category_id=payload.category_id,
         is_active=payload.is_active,
     )
-    return catalog_crud.get_product(db, product.id)
+    return product
 
 
 @router.put("/products/{product_id}", response_model=ProductRead, dependencies=[Depends(require_admin)])
@@ -61,7 +333,7 @@ def update_product(product_id: int, payload: ProductUpdate, db: Session = Depend
     if not product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found.")
 
-    updated = catalog_crud.update_product(
+    return catalog_crud.update_product(
         db,
         product,
         name=payload.name,
@@ -70,7 +342,6 @@ def update_product(product_id: int, payload: ProductUpdate, db: Session = Depend
         category_id=payload.category_id,
         is_active=payload.is_active,
     )
-    return catalog_crud.get_product(db, updated.id)
 
 
 @router.delete("/products/{product_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_admin)])
@@ -187,3 +458,18 @@ def delete_image(image_id: int, db: Session = Depends(get_db)):
     if not image:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found.")
     catalog_crud.delete_variant_image(db, image)
+
+
+@router.post("/import", response_model=CatalogImportReport, dependencies=[Depends(require_admin)])
+def import_catalog(
+    file: UploadFile = File(...),
+    file_format: str | None = Query(default=None, alias="format", pattern="^(csv|ndjson)$"),
+    chunk_size: int | None = Query(default=None, ge=1, le=5000),
+    db: Session = Depends(get_db),
+):
+    if file_format is None:
+        extension = (file.filename or "").rsplit(".", 1)[-1].lower()
+        file_format = "ndjson" if extension in ("ndjson", "jsonl") else "csv"
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    records = catalog_import.iter_import_records(stream, file_format)
+    return catalog_import.import_catalog(db, records, chunk_size=chunk_size)
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.db import get_db
 from app.core.deps import require_admin
+from app.core.pagination import cursor_id, set_next_cursor
 from app.crud import category as category_crud
 from app.schemas.category import CategoryCreate, CategoryRead, CategoryUpdate
 
@@ -11,12 +12,22 @@ router = APIRouter(prefix="/categories", tags=["Categories"])
 
 @router.get("", response_model=list[CategoryRead])
 def list_categories(
+    response: Response,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
     only_active: bool = True,
     db: Session = Depends(get_db),
 ):
-    return category_crud.list_categories(db, skip=skip, limit=limit, only_active=only_active)
+    categories = category_crud.list_categories(
+        db,
+        skip=skip,
+        limit=limit,
+        only_active=only_active,
+        after_id=cursor_id(cursor),
+    )
+    set_next_cursor(response, categories, limit)
+    return categories
 
 
 @router.get("/{category_id}", response_model=CategoryRead)
@@ -1,54 +1,175 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import csv
+import io
+import json
+from collections.abc import Iterator
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.core.db import get_db
-from app.core.deps import get_current_user, require_admin
+from app.core.db import SessionLocal, get_db
+from app.core.deps import get_current_principal, get_current_user, require_admin
+from app.core.pagination import cursor_id, next_cursor_headers
+from app.core.responses import adapter_response
 from app.crud import sale as sale_crud
-from app.schemas.sale import SaleCreate, SaleRead
+from app.schemas.sale import SaleCreate, SaleRead, sale_list_adapter, sale_read_adapter
 
 router = APIRouter(prefix="/sales", tags=["Sales"])
 
 
 @router.post("", response_model=SaleRead, status_code=status.HTTP_201_CREATED)
-def create_sale(payload: SaleCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def create_sale(
+    payload: SaleCreate,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+    idempotency_key: str | None = Header(default=None, min_length=1, max_length=255),
+):
+    items = [(item.product_id, item.quantity, item.unit_price, item.variant_id) for item in payload.items]
+    replayed = False
     try:
-        return sale_crud.create_sale(
-            db,
-            user_id=current_user.id,
-            items=[(item.product_id, item.quantity, item.unit_price) for item in payload.items],
-        )
+        if idempotency_key is None:
+            sale = sale_crud.create_sale(db, user_id=current_user.id, items=items)
+        else:
+            sale, replayed = sale_crud.create_sale_idempotent(
+                db,
+                user_id=current_user.id,
+                key=idempotency_key,
+                items=items,
+            )
+    except sale_crud.IdempotencyKeyMismatch as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc)) from exc
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return adapter_response(sale_read_adapter, sale, status_code=status.HTTP_201_CREATED, headers=headers)
 
 
 @router.get("/me", response_model=list[SaleRead])
 def list_my_sales(
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    current_user=Depends(get_current_principal),
 ):
-    return sale_crud.list_sales_by_user(db, current_user.id, skip=skip, limit=limit)
+    sales = sale_crud.list_sales_by_user(
+        db,
+        current_user.id,
+        skip=skip,
+        limit=limit,
+        before_id=cursor_id(cursor),
+    )
+    return adapter_response(sale_list_adapter, sales, headers=next_cursor_headers(sales, limit))
 
 
 @router.get("", response_model=list[SaleRead], dependencies=[Depends(require_admin)])
 def list_all_sales(
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
 ):
-    return sale_crud.list_sales(db, skip=skip, limit=limit)
+    sales = sale_crud.list_sales(db, skip=skip, limit=limit, before_id=cursor_id(cursor))
+    return adapter_response(sale_list_adapter, sales, headers=next_cursor_headers(sales, limit))
+
+
+EXPORT_CSV_COLUMNS = (
+    "sale_id",
+    "date",
+    "user_id",
+    "total_amount",
+    "item_id",
+    "product_id",
+    "variant_id",
+    "quantity",
+    "unit_price",
+)
+
+
+def _export_value(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, int):
+        return value
+    return str(value)
+
+
+def _export_ndjson(rows) -> Iterator[str]:
+    current = None
+    for row in rows:
+        if current is None or current["id"] != row.sale_id:
+            if current is not None:
+                yield json.dumps(current) + "\n"
+            current = {
+                "id": row.sale_id,
+                "date": _export_value(row.date),
+                "user_id": row.user_id,
+                "total_amount": _export_value(row.total_amount),
+                "items": [],
+            }
+        if row.item_id is not None:
+            current["items"].append(
+                {
+                    "id": row.item_id,
+                    "product_id": row.product_id,
+                    "variant_id": row.variant_id,
+                    "quantity": row.quantity,
+                    "unit_price": _export_value(row.unit_price),
+                }
+            )
+    if current is not None:
+        yield json.dumps(current) + "\n"
+
+
+def _export_csv(rows) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_CSV_COLUMNS)
+    for row in rows:
+        writer.writerow(["" if value is None else _export_value(value) for value in row])
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _stream_sales_export(file_format: str, date_from: datetime | None, date_to: datetime | None) -> Iterator[str]:
+    # Sesion propia: el generador sigue leyendo del cursor mientras se envia la respuesta.
+    db = SessionLocal()
+    try:
+        rows = sale_crud.iter_sales_for_export(db, date_from=date_from, date_to=date_to)
+        yield from (_export_csv(rows) if file_format == "csv" else _export_ndjson(rows))
+    finally:
+        db.close()
+
+
+@router.get("/export", dependencies=[Depends(require_admin)])
+def export_sales(
+    file_format: str = Query(default="ndjson", alias="format", pattern="^(csv|ndjson)$"),
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+):
+    media_type = "text/csv" if file_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_sales_export(file_format, date_from, date_to),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="sales.{file_format}"'},
+    )
 
 
 @router.get("/{sale_id}", response_model=SaleRead)
-def get_sale(sale_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def get_sale(sale_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_principal)):
     sale = sale_crud.get_sale(db, sale_id)
     if not sale:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sale not found.")
 
     if current_user.role != "admin" and sale.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions.")
-    return sale
+    return adapter_response(sale_read_adapter, sale)
 
 
 @router.delete("/{sale_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_admin)])
@@ -56,4 +177,7 @@ def delete_sale(sale_id: int, db: Session = Depends(get_db)):
     sale = sale_crud.get_sale(db, sale_id)
     if not sale:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sale not found.")
-    sale_crud.delete_sale(db, sale)
+    try:
+        sale_crud.delete_sale(db, sale)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.db import get_db
 from app.core.deps import get_current_user, require_admin
+from app.core.pagination import cursor_id, set_next_cursor
 from app.core.security import hash_password
 from app.crud import user as user_crud
 from app.schemas.user import UserRead, UserUpdate
@@ -12,11 +13,15 @@ router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.get("", response_model=list[UserRead], dependencies=[Depends(require_admin)])
 def list_users(
+    response: Response,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
 ):
-    return user_crud.list_users(db, skip=skip, limit=limit)
+    users = user_crud.list_users(db, skip=skip, limit=limit, after_id=cursor_id(cursor))
+    set_next_cursor(response, users, limit)
+    return users
 
 
 @router.get("/me", response_model=UserRead)
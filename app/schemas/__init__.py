@@ -1,20 +1,36 @@
+from app.schemas.analytics import BasketSummaryRead, CategorySalesRead, DailyRevenueRead, ProductSalesRead
 from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
 from app.schemas.category import CategoryCreate, CategoryRead, CategoryUpdate
 from app.schemas.catalog import (
+    CatalogImportError,
+    CatalogImportReport,
+    CatalogImportRow,
     ProductCreate,
     ProductImageCreate,
     ProductImageRead,
     ProductImageUpdate,
     ProductRead,
+    ProductSearchFacets,
+    ProductSearchResponse,
+    ProductSummaryRead,
     ProductUpdate,
     ProductVariantCreate,
     ProductVariantRead,
     ProductVariantUpdate,
+    SearchFacetCount,
+    SearchPriceRange,
+    SkuLookupRequest,
+    SkuLookupResponse,
+    SkuStockRead,
 )
 from app.schemas.sale import SaleCreate, SaleItemCreate, SaleItemRead, SaleRead
 from app.schemas.user import UserCreate, UserRead, UserUpdate
 
 __all__ = [
+    "DailyRevenueRead",
+    "ProductSalesRead",
+    "CategorySalesRead",
+    "BasketSummaryRead",
     "LoginRequest",
     "RegisterRequest",
     "TokenResponse",
@@ -24,12 +40,23 @@ __all__ = [
     "ProductCreate",
     "ProductUpdate",
     "ProductRead",
+    "ProductSummaryRead",
     "ProductVariantCreate",
     "ProductVariantUpdate",
     "ProductVariantRead",
     "ProductImageCreate",
     "ProductImageUpdate",
     "ProductImageRead",
+    "CatalogImportRow",
+    "CatalogImportError",
+    "CatalogImportReport",
+    "SearchFacetCount",
+    "SearchPriceRange",
+    "ProductSearchFacets",
+    "ProductSearchResponse",
+    "SkuStockRead",
+    "SkuLookupRequest",
+    "SkuLookupResponse",
     "UserCreate",
     "UserUpdate",
     "UserRead",
@@ -0,0 +1,34 @@
+from datetime import date
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+
+class DailyRevenueRead(BaseModel):
+    day: date
+    sales_count: int
+    units: int
+    revenue: Decimal
+    average_basket: Decimal
+
+
+class ProductSalesRead(BaseModel):
+    product_id: int
+    units: int
+    revenue: Decimal
+
+
+class CategorySalesRead(BaseModel):
+    category_id: int
+    units: int
+    revenue: Decimal
+
+
+class BasketSummaryRead(BaseModel):
+    date_from: date | None = None
+    date_to: date | None = None
+    sales_count: int
+    units: int
+    revenue: Decimal
+    average_basket: Decimal
+    average_units: Decimal
@@ -1,6 +1,6 @@
 from decimal import Decimal
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator, model_validator
 
 
 class ProductImageBase(BaseModel):
@@ -93,3 +93,128 @@ class ProductRead(ProductBase):
 
     id: int
     variants: list[ProductVariantRead] = Field(default_factory=list)
+
+
+class ProductSummaryRead(BaseModel):
+    """Vista reducida para grillas de listado (view=summary)."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    price: Decimal
+    min_price: Decimal | None = None
+    max_price: Decimal | None = None
+    category_id: int
+    image_url: str | None = None
+    in_stock: bool
+
+
+class CatalogImportRow(BaseModel):
+    """Una fila del import masivo: una variante y, si hace falta, su producto."""
+
+    product_id: int | None = Field(default=None, gt=0)
+    product_name: str | None = Field(default=None, min_length=1, max_length=200)
+    description: str | None = Field(default=None, max_length=2000)
+    price: Decimal | None = Field(default=None, gt=0)
+    category_id: int | None = Field(default=None, gt=0)
+    product_is_active: bool | None = None
+    sku: str = Field(min_length=1, max_length=100)
+    size: str = Field(min_length=1, max_length=50)
+    color: str = Field(min_length=1, max_length=50)
+    stock: int = Field(default=0, ge=0)
+    price_override: Decimal | None = None
+    is_active: bool = True
+    images: list[str] = Field(default_factory=list)
+
+    @field_validator("images", mode="before")
+    @classmethod
+    def split_images(cls, value):
+        # En CSV las URLs llegan en una sola columna separadas por "|".
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [url.strip() for url in value.split("|") if url.strip()]
+        return value
+
+    @field_validator("images")
+    @classmethod
+    def validate_images_limit(cls, value: list[str]) -> list[str]:
+        if len(value) > 8:
+            raise ValueError("Each variant supports at most 8 images.")
+        return value
+
+    @model_validator(mode="after")
+    def validate_product_reference(self) -> "CatalogImportRow":
+        if self.product_id is None and (self.product_name is None or self.category_id is None):
+            raise ValueError("Either product_id or product_name and category_id are required.")
+        return self
+
+
+class CatalogImportError(BaseModel):
+    row: int
+    sku: str | None = None
+    message: str
+
+
+class CatalogImportReport(BaseModel):
+    rows_total: int = 0
+    rows_imported: int = 0
+    products_created: int = 0
+    products_updated: int = 0
+    variants_upserted: int = 0
+    images_upserted: int = 0
+    errors: list[CatalogImportError] = Field(default_factory=list)
+    errors_truncated: bool = False
+
+
+class SearchFacetCount(BaseModel):
+    value: int | str
+    count: int
+
+
+class SearchPriceRange(BaseModel):
+    min: Decimal
+    max: Decimal
+
+
+class ProductSearchFacets(BaseModel):
+    categories: list[SearchFacetCount] = Field(default_factory=list)
+    sizes: list[SearchFacetCount] = Field(default_factory=list)
+    colors: list[SearchFacetCount] = Field(default_factory=list)
+    in_stock: int = 0
+    price: SearchPriceRange | None = None
+
+
+class ProductSearchResponse(BaseModel):
+    total: int
+    items: list[ProductRead]
+    facets: ProductSearchFacets
+
+
+class SkuStockRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    sku: str
+    variant_id: int
+    product_id: int
+    stock: int
+    price: Decimal
+    is_active: bool
+
+
+class SkuLookupRequest(BaseModel):
+    skus: list[str] = Field(min_length=1, max_length=1000)
+
+
+class SkuLookupResponse(BaseModel):
+    items: list[SkuStockRead]
+    missing: list[str] = Field(default_factory=list)
+
+
+# Serializacion directa a bytes (validate_python + dump_json) para las rutas de lectura.
+product_read_adapter = TypeAdapter(ProductRead)
+product_list_adapter = TypeAdapter(list[ProductRead])
+product_summary_list_adapter = TypeAdapter(list[ProductSummaryRead])
+sku_stock_adapter = TypeAdapter(SkuStockRead)
+sku_lookup_adapter = TypeAdapter(SkuLookupResponse)
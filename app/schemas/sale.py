@@ -1,11 +1,12 @@
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class SaleItemCreate(BaseModel):
     product_id: int = Field(gt=0)
+    variant_id: int | None = Field(default=None, gt=0)
     quantity: int = Field(gt=0)
     unit_price: Decimal | None = Field(default=None, gt=0)
 
@@ -20,6 +21,7 @@ class SaleItemRead(BaseModel):
     id: int
     sale_id: int
     product_id: int
+    variant_id: int | None = None
     quantity: int
     unit_price: Decimal
 
@@ -32,3 +34,7 @@ class SaleRead(BaseModel):
     total_amount: Decimal
     user_id: int
     items: list[SaleItemRead]
+
+
+sale_read_adapter = TypeAdapter(SaleRead)
+sale_list_adapter = TypeAdapter(list[SaleRead])
@@ -0,0 +1,102 @@
+"""
+Throughput de lectura del catalogo con el stack sync (threadpool) y el async (ASYNC_DB_ENABLED),
+con muchos clientes concurrentes. Cada modo corre en su propio proceso, porque la configuracion
+se lee al importar app.
+Uso: python -m bench.async_throughput [--clients 200] [--duration 10] [--products 2000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+MODES = {"sync": "false", "async": "true"}
+
+
+async def _client_loop(client, product_ids: list[int], deadline: float, latencies: list[float]) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        if random.random() < 0.5:
+            response = await client.get(f"/catalog/products/{random.choice(product_ids)}")
+        else:
+            response = await client.get("/catalog/products", params={"limit": 20, "skip": random.randrange(0, 500)})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+async def _run_load(clients: int, duration: float, products: int) -> dict:
+    import httpx
+
+    from app.main import app
+
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        product_ids = list(range(1, products + 1))
+        # Calentamiento: conexiones del pool abiertas y rutas compiladas.
+        await asyncio.gather(*(client.get(f"/catalog/products/{product_id}") for product_id in product_ids[:50]))
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*(_client_loop(client, product_ids, deadline, latencies) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    return {"requests": len(latencies), "seconds": elapsed, "latencies": latencies}
+
+
+def worker(args: argparse.Namespace) -> None:
+    from bench import common
+
+    from app.core.db import SessionLocal
+
+    common.reset_database()
+    with SessionLocal() as db:
+        common.seed_catalog(db, products=args.products, variants_per_product=4, images_per_variant=2)
+    result = asyncio.run(_run_load(args.clients, args.duration, args.products))
+    print(json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        worker(args)
+        return
+
+    from bench import common
+
+    rows = []
+    for mode, async_enabled in MODES.items():
+        env = {
+            **os.environ,
+            "ASYNC_DB_ENABLED": async_enabled,
+            # Sin cache de respuestas: cada request llega a la base.
+            "CATALOG_CACHE_ENABLED": "false",
+            "DB_POOL_SIZE": os.environ.get("DB_POOL_SIZE", "20"),
+        }
+        command = [
+            sys.executable, "-m", "bench.async_throughput", "--worker", mode,
+            "--clients", str(args.clients), "--duration", str(args.duration), "--products", str(args.products),
+        ]
+        output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        rows.append(
+            [
+                mode,
+                result["requests"],
+                f"{result['requests'] / result['seconds']:.0f}",
+                *common.summarize_ms(result["latencies"]),
+            ]
+        )
+
+    print(f"Catalog reads, {args.clients} concurrent clients for {args.duration:g}s ({common.engine.dialect.name})")
+    common.print_table(["mode", "requests", "req/s", "p50 ms", "p95 ms", "mean ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
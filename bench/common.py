@@ -0,0 +1,234 @@
+"""
+Utilidades compartidas de los benchmarks. Se importa antes que app: fija DATABASE_URL
+(BENCH_DATABASE_URL o una SQLite temporal) y el resto de la configuracion minima.
+"""
+import logging
+import math
+import os
+import re
+import statistics
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Sequence
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+_BENCH_DIR = tempfile.mkdtemp(prefix="tienda-bench-")
+os.environ["DATABASE_URL"] = os.environ.get("BENCH_DATABASE_URL") or f"sqlite:///{_BENCH_DIR}/bench.sqlite"
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("PASSWORD_HASHER_EXECUTOR", "thread")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from sqlalchemy import event, insert, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.cache import get_catalog_cache, principal_cache  # noqa: E402
+from app.core.db import Base, engine  # noqa: E402
+from app.core.security import hash_password  # noqa: E402
+from app.crud.catalog_search import memory_search_index  # noqa: E402
+from app.crud.sku_stock import sku_stock_index  # noqa: E402
+from app.crud.user import create_user  # noqa: E402
+from app.models import Category, Product, ProductImage, ProductVariant, Sale, SaleItem, User  # noqa: E402
+
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_PASSWORD = "secret1"
+SIZES = ("XS", "S", "M", "L", "XL")
+COLORS = ("black", "white", "red", "blue", "green", "grey", "beige", "navy")
+
+_SERVER_TIMING_QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+# Los carritos grandes repiten a proposito el UPDATE de stock por variante; no es un N+1 a reportar.
+logging.getLogger("app.core.sql_stats").setLevel(logging.ERROR)
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, _):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+
+def reset_database() -> None:
+    """Base vacia con el esquema de los modelos y los caches en memoria limpios."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    get_catalog_cache().clear()
+    principal_cache.clear()
+    sku_stock_index.clear()
+    memory_search_index.clear()
+
+
+def _insert_chunks(db: Session, model, rows: Iterable[dict], chunk_size: int = 5000) -> None:
+    chunk: list[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            db.execute(insert(model), chunk)
+            chunk = []
+    if chunk:
+        db.execute(insert(model), chunk)
+
+
+def seed_catalog(
+    db: Session,
+    *,
+    products: int,
+    variants_per_product: int = 4,
+    images_per_variant: int = 1,
+    categories: int = 10,
+    stock: int = 1000,
+) -> list[tuple[int, int]]:
+    """
+    Carga el catalogo con INSERT masivos (ids explicitos, columnas de resumen ya calculadas).
+    Devuelve los pares (product_id, variant_id) de la primera variante de cada producto.
+    """
+    _insert_chunks(
+        db,
+        Category,
+        ({"id": n, "name": f"Category {n}", "slug": f"category-{n}"} for n in range(1, categories + 1)),
+    )
+
+    def product_rows():
+        for n in range(1, products + 1):
+            price = Decimal(10 + n % 90)
+            yield {
+                "id": n,
+                "name": f"{COLORS[n % len(COLORS)].title()} shirt {n}",
+                "description": f"Cotton shirt number {n}",
+                "price": price,
+                "category_id": n % categories + 1,
+                "is_active": True,
+                "version": 1,
+                "min_price": price,
+                "max_price": price,
+                "total_stock": stock * variants_per_product,
+                "active_variant_count": variants_per_product,
+                "primary_image_url": f"https://img.example.com/{n}/1/1.jpg" if images_per_variant else None,
+            }
+
+    def variant_rows():
+        for n in range(1, products + 1):
+            for v in range(variants_per_product):
+                yield {
+                    "id": (n - 1) * variants_per_product + v + 1,
+                    "product_id": n,
+                    "sku": f"SKU-{n}-{v}",
+                    "size": SIZES[v % len(SIZES)],
+                    "color": COLORS[(n + v) % len(COLORS)],
+                    "stock": stock,
+                    "is_active": True,
+                }
+
+    def image_rows():
+        for variant_id in range(1, products * variants_per_product + 1):
+            for position in range(1, images_per_variant + 1):
+                yield {
+                    "product_variant_id": variant_id,
+                    "image_url": f"https://img.example.com/v{variant_id}/{position}.jpg",
+                    "position": position,
+                }
+
+    _insert_chunks(db, Product, product_rows())
+    _insert_chunks(db, ProductVariant, variant_rows())
+    _insert_chunks(db, ProductImage, image_rows())
+    if engine.dialect.name == "postgresql":
+        # Con ids explicitos las secuencias quedan atras; las altas por la API fallarian.
+        for table in ("categories", "products", "product_variants"):
+            db.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"))
+    db.commit()
+    return [(n, (n - 1) * variants_per_product + 1) for n in range(1, products + 1)]
+
+
+def seed_sales(
+    db: Session,
+    lines: Sequence[tuple[int, int]],
+    *,
+    sales: int,
+    items_per_sale: int = 3,
+    days: int = 365,
+) -> None:
+    """
+    Carga ventas historicas con INSERT masivos, repartidas en los ultimos days dias, del admin.
+    lines son los (product_id, variant_id) que devuelve seed_catalog; no se toca el stock.
+    """
+    user_id = db.query(User.id).filter(User.email == ADMIN_EMAIL).scalar()
+    categories = dict(db.query(Product.id, Product.category_id))
+    prices = dict(db.query(Product.id, Product.price))
+    start = datetime(2026, 1, 1)
+
+    def sale_rows():
+        for n in range(1, sales + 1):
+            chosen = [lines[(n * 7 + i) % len(lines)] for i in range(items_per_sale)]
+            yield {
+                "id": n,
+                "date": start + timedelta(days=n % days, seconds=n % 86400),
+                "total_amount": sum(prices[product_id] for product_id, _ in chosen),
+                "user_id": user_id,
+            }
+
+    def item_rows():
+        for n in range(1, sales + 1):
+            for i in range(items_per_sale):
+                product_id, variant_id = lines[(n * 7 + i) % len(lines)]
+                yield {
+                    "sale_id": n,
+                    "product_id": product_id,
+                    "variant_id": variant_id,
+                    "category_id": categories[product_id],
+                    "quantity": 1,
+                    "unit_price": prices[product_id],
+                }
+
+    _insert_chunks(db, Sale, sale_rows())
+    _insert_chunks(db, SaleItem, item_rows())
+    if engine.dialect.name == "postgresql":
+        db.execute(text("SELECT setval(pg_get_serial_sequence('sales', 'id'), (SELECT max(id) FROM sales))"))
+    db.commit()
+
+
+def create_admin(db: Session) -> None:
+    create_user(db, username="admin", email=ADMIN_EMAIL, hashed_password=hash_password(ADMIN_PASSWORD), role="admin")
+
+
+def login_headers(client, email: str = ADMIN_EMAIL, password: str = ADMIN_PASSWORD) -> dict[str, str]:
+    response = client.post("/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def statement_count(response) -> int:
+    """Sentencias SQL del request, segun el header Server-Timing de SQLStatsMiddleware."""
+    match = _SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+    return int(match.group(1)) if match else -1
+
+
+def measure(function: Callable[[], object], repeat: int, warmup: int = 1) -> list[float]:
+    """Duracion en segundos de cada llamada (despues de warmup llamadas que no se cuentan)."""
+    for _ in range(warmup):
+        function()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize_ms(samples: Sequence[float]) -> list[str]:
+    """[p50, p95, media] en milisegundos, para las tablas de resultados."""
+    return [
+        f"{statistics.median(samples) * 1000:.2f}",
+        f"{percentile(samples, 0.95) * 1000:.2f}",
+        f"{statistics.fmean(samples) * 1000:.2f}",
+    ]
+
+
+def print_table(headers: Sequence[str], rows: Iterable[Sequence[object]]) -> None:
+    rows = [[str(value) for value in row] for row in rows]
+    widths = [max(len(str(header)), *(len(row[i]) for row in rows)) for i, header in enumerate(headers)]
+    print("  ".join(str(header).rjust(width) for header, width in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths)))
@@ -0,0 +1,65 @@
+"""
+Compresion de las respuestas del catalogo: tamano y tiempo de compresion por codificacion
+con COMPRESSION_MINIMUM_SIZE, COMPRESSION_GZIP_LEVEL y COMPRESSION_BROTLI_QUALITY configurados
+(se pueden cambiar por variable de entorno). br solo aparece si el paquete brotli esta instalado.
+Uso: python -m bench.compression [--products 100] [--images 4] [--repeat 50]
+"""
+import argparse
+
+from bench import common  # primero: configura el entorno antes de importar app
+
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.core.compression import available_encodings, compress  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.db import SessionLocal  # noqa: E402
+from app.models import Product, ProductVariant  # noqa: E402
+from app.router.catalog import build_product_list_response, build_product_response  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--images", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    common.reset_database()
+    with SessionLocal() as db:
+        common.seed_catalog(db, products=args.products, variants_per_product=4, images_per_variant=args.images)
+        products = (
+            db.query(Product)
+            .options(selectinload(Product.variants).selectinload(ProductVariant.images))
+            .order_by(Product.id)
+            .all()
+        )
+        list_body = build_product_list_response(products, len(products)).body
+        bodies = {
+            # Un cuerpo justo en el umbral: el caso donde comprimir rinde menos.
+            "threshold slice": list_body[: settings.COMPRESSION_MINIMUM_SIZE],
+            "product detail": build_product_response(products[0]).body,
+            "list of 20": build_product_list_response(products[:20], 20).body,
+            f"list of {len(products)}": list_body,
+        }
+
+    rows = []
+    for payload, body in bodies.items():
+        rows.append([payload, "identity", len(body), "1.00", "-", "-", "-"])
+        if len(body) < settings.COMPRESSION_MINIMUM_SIZE:
+            continue
+        for encoding in available_encodings():
+            compressed = compress(body, encoding)
+            samples = common.measure(lambda: compress(body, encoding), args.repeat)
+            ratio = f"{len(compressed) / len(body):.2f}"
+            rows.append([payload, encoding, len(compressed), ratio, *common.summarize_ms(samples)])
+
+    print(
+        f"Catalog response compression (minimum size {settings.COMPRESSION_MINIMUM_SIZE} B, "
+        f"gzip level {settings.COMPRESSION_GZIP_LEVEL}, brotli quality {settings.COMPRESSION_BROTLI_QUALITY}, "
+        f"{args.repeat} runs)"
+    )
+    common.print_table(["payload", "encoding", "bytes", "ratio", "p50 ms", "p95 ms", "mean ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
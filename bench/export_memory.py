@@ -0,0 +1,103 @@
+"""
+GET /sales/export: pico de memoria (tracemalloc) al exportar cada vez mas ventas.
+Con el streaming el pico no deberia crecer con la cantidad de filas.
+Uso: python -m bench.export_memory [--sales 40000] [--format ndjson]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+from bench import common  # primero: configura el entorno antes de importar app
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.db import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+
+SALE_DAYS = 365
+FRACTIONS = (0.125, 0.25, 0.5, 1.0)
+
+
+async def stream_export(headers: dict[str, str], params: dict[str, str]) -> int:
+    """
+    Llama a la app ASGI directamente y descarta cada chunk al recibirlo: los clientes de test
+    (TestClient, httpx.ASGITransport) juntan el cuerpo entero y taparian lo que se quiere medir.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/sales/export",
+        "raw_path": b"/sales/export",
+        "root_path": "",
+        "query_string": urlencode(params).encode("ascii"),
+        "headers": [(b"host", b"bench"), *((k.lower().encode(), v.encode()) for k, v in headers.items())],
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+    finished = asyncio.Event()
+    request_sent = False
+    received = 0
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal received
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"Export failed with status {message['status']}.")
+        if message["type"] == "http.response.body":
+            received += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                finished.set()
+
+    await app(scope, receive, send)
+    return received
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sales", type=int, default=40_000)
+    parser.add_argument("--format", default="ndjson", choices=("ndjson", "csv"))
+    args = parser.parse_args()
+
+    common.reset_database()
+    with SessionLocal() as db:
+        lines = common.seed_catalog(db, products=200, variants_per_product=2)
+        common.create_admin(db)
+        common.seed_sales(db, lines, sales=args.sales, days=SALE_DAYS)
+    with TestClient(app) as client:
+        headers = common.login_headers(client)
+
+    start = datetime(2026, 1, 1)
+    rows = []
+    tracemalloc.start()
+    for fraction in FRACTIONS:
+        params = {"format": args.format, "date_to": (start + timedelta(days=SALE_DAYS * fraction)).isoformat()}
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        received = asyncio.run(stream_export(headers, params))
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        rows.append(
+            [f"~{round(args.sales * fraction)}", f"{received / 1024 ** 2:.1f}", f"{peak / 1024 ** 2:.2f}", f"{elapsed:.2f}"]
+        )
+    tracemalloc.stop()
+
+    print(f"GET /sales/export?format={args.format} ({common.engine.dialect.name}, 3 items per sale)")
+    common.print_table(["sales", "body MiB", "peak MiB", "seconds"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+POST /auth/login: logins por segundo segun la cantidad de workers del executor de bcrypt
+(PASSWORD_HASHER_WORKERS) y el costo (BCRYPT_ROUNDS). Cada combinacion corre en su propio proceso.
+Uso: python -m bench.login_throughput [--workers 1,2,4] [--rounds 8,10,12] [--clients 32] [--duration 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+
+async def _login(client):
+    from bench import common
+
+    return await client.post("/auth/login", json={"email": common.ADMIN_EMAIL, "password": common.ADMIN_PASSWORD})
+
+
+async def _client_loop(client, deadline: float, statuses: Counter, latencies: list[float]) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await _login(client)
+        statuses[response.status_code] += 1
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - started)
+
+
+async def _run_load(clients: int, duration: float) -> dict:
+    import httpx
+
+    from app.main import app
+
+    statuses: Counter = Counter()
+    latencies: list[float] = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        # Calentamiento: arranca los procesos del executor antes de medir.
+        (await _login(client)).raise_for_status()
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*(_client_loop(client, deadline, statuses, latencies) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    return {"statuses": statuses, "seconds": elapsed, "latencies": latencies}
+
+
+def worker(args: argparse.Namespace) -> None:
+    from bench import common
+
+    from app.core.db import SessionLocal
+    from app.core.security import shutdown_password_executor
+
+    common.reset_database()
+    with SessionLocal() as db:
+        common.create_admin(db)
+    try:
+        result = asyncio.run(_run_load(args.clients, args.duration))
+    finally:
+        shutdown_password_executor()
+    print(json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--rounds", default="8,10,12")
+    parser.add_argument("--executor", default="process", choices=("process", "thread", "inline"))
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        worker(args)
+        return
+
+    from bench import common
+
+    rows = []
+    for rounds in args.rounds.split(","):
+        for workers in args.workers.split(","):
+            env = {
+                **os.environ,
+                "BCRYPT_ROUNDS": rounds,
+                "PASSWORD_HASHER_WORKERS": workers,
+                "PASSWORD_HASHER_EXECUTOR": args.executor,
+            }
+            command = [
+                sys.executable, "-m", "bench.login_throughput", "--worker",
+                "--clients", str(args.clients), "--duration", str(args.duration),
+            ]
+            output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            ok = result["statuses"].get("200", 0)
+            rows.append(
+                [
+                    rounds,
+                    workers,
+                    f"{ok / result['seconds']:.1f}",
+                    result["statuses"].get("503", 0),
+                    *(common.summarize_ms(result["latencies"]) if result["latencies"] else ["-", "-", "-"]),
+                ]
+            )
+
+    print(f"POST /auth/login, {args.executor} executor, {args.clients} concurrent clients for {args.duration:g}s")
+    common.print_table(["rounds", "workers", "logins/s", "503s", "p50 ms", "p95 ms", "mean ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
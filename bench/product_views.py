@@ -0,0 +1,63 @@
+"""
+GET /catalog/products: vista summary contra la vista completa, con 8 imagenes por variante.
+Muestra KiB sin comprimir y con gzip, sentencias SQL y p50/p95. Por defecto el cache del
+catalogo esta desactivado para medir el camino hasta la base; --cache mide los hits.
+Uso: python -m bench.product_views [--products 2000] [--images 8] [--repeat 50] [--cache]
+"""
+import argparse
+
+from bench import common  # primero: configura el entorno antes de importar app
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.db import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--images", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--cache", action="store_true")
+    args = parser.parse_args()
+    settings.CATALOG_CACHE_ENABLED = args.cache
+
+    common.reset_database()
+    with SessionLocal() as db:
+        common.seed_catalog(db, products=args.products, variants_per_product=4, images_per_variant=args.images)
+
+    rows = []
+    with TestClient(app) as client:
+        for limit in (20, 100):
+            for view in ("full", "summary"):
+                params = {"limit": limit, "view": view}
+                identity = client.get("/catalog/products", params=params, headers={"Accept-Encoding": "identity"})
+                gzipped = client.get("/catalog/products", params=params, headers={"Accept-Encoding": "gzip"})
+                identity.raise_for_status()
+
+                def fetch() -> None:
+                    client.get("/catalog/products", params=params).raise_for_status()
+
+                samples = common.measure(fetch, args.repeat)
+                rows.append(
+                    [
+                        limit,
+                        view,
+                        f"{len(identity.content) / 1024:.1f}",
+                        f"{int(gzipped.headers.get('content-length', len(gzipped.content))) / 1024:.1f}",
+                        common.statement_count(identity),
+                        *common.summarize_ms(samples),
+                    ]
+                )
+
+    print(
+        f"GET /catalog/products ({common.engine.dialect.name}, {args.products} products x 4 variants x "
+        f"{args.images} images, catalog cache {'on' if args.cache else 'off'}, {args.repeat} requests)"
+    )
+    common.print_table(["limit", "view", "KiB", "gzip KiB", "queries", "p50 ms", "p95 ms", "mean ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
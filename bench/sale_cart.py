@@ -0,0 +1,52 @@
+"""
+POST /sales: sentencias SQL y latencia segun la cantidad de lineas del carrito.
+Uso: python -m bench.sale_cart [--sizes 1,5,10,20,40] [--repeat 30]
+"""
+import argparse
+
+from bench import common  # primero: configura el entorno antes de importar app
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.db import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1,5,10,20,40")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    common.reset_database()
+    with SessionLocal() as db:
+        lines = common.seed_catalog(db, products=max(sizes), variants_per_product=2)
+        common.create_admin(db)
+
+    rows = []
+    with TestClient(app) as client:
+        headers = common.login_headers(client)
+        for size in sizes:
+            cart = {
+                "items": [
+                    {"product_id": product_id, "variant_id": variant_id, "quantity": 1}
+                    for product_id, variant_id in lines[:size]
+                ]
+            }
+            counts = []
+
+            def post_sale() -> None:
+                response = client.post("/sales", json=cart, headers=headers)
+                response.raise_for_status()
+                counts.append(common.statement_count(response))
+
+            samples = common.measure(post_sale, args.repeat)
+            rows.append([size, max(counts), *common.summarize_ms(samples)])
+
+    print(f"POST /sales ({common.engine.dialect.name}, {args.repeat} requests per cart size)")
+    common.print_table(["lines", "statements", "p50 ms", "p95 ms", "mean ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
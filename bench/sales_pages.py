@@ -0,0 +1,65 @@
+"""
+GET /sales: latencia de paginas profundas con skip (OFFSET) y con cursor (keyset).
+Uso: python -m bench.sales_pages [--sales 60000] [--pages 1,100,1000] [--limit 50] [--repeat 20]
+"""
+import argparse
+
+from bench import common  # primero: configura el entorno antes de importar app
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.db import SessionLocal  # noqa: E402
+from app.core.pagination import encode_cursor  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Sale  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sales", type=int, default=60_000)
+    parser.add_argument("--pages", default="1,100,1000")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    pages = [int(page) for page in args.pages.split(",")]
+    if max(pages) * args.limit > args.sales:
+        parser.error("--sales is too small for the deepest page.")
+
+    common.reset_database()
+    with SessionLocal() as db:
+        lines = common.seed_catalog(db, products=200, variants_per_product=2)
+        common.create_admin(db)
+        common.seed_sales(db, lines, sales=args.sales)
+        # El cursor de la pagina N es el id de la ultima venta de la pagina N - 1.
+        cursors = {
+            page: encode_cursor(
+                id=db.query(Sale.id).order_by(Sale.id.desc()).offset((page - 1) * args.limit - 1).limit(1).scalar()
+            )
+            for page in pages
+            if page > 1
+        }
+
+    rows = []
+    with TestClient(app) as client:
+        headers = common.login_headers(client)
+        for page in pages:
+            modes = {"skip": {"skip": (page - 1) * args.limit}}
+            if page > 1:
+                modes["cursor"] = {"cursor": cursors[page]}
+            results = {}
+            for mode, params in modes.items():
+                def get_page() -> None:
+                    response = client.get("/sales", params={"limit": args.limit, **params}, headers=headers)
+                    response.raise_for_status()
+                    results[mode] = [sale["id"] for sale in response.json()]
+
+                rows.append([page, mode, *common.summarize_ms(common.measure(get_page, args.repeat))])
+            if len(results) == 2 and results["skip"] != results["cursor"]:
+                raise SystemExit(f"Page {page}: skip and cursor returned different sales.")
+
+    print(f"GET /sales?limit={args.limit} ({common.engine.dialect.name}, {args.sales} sales, {args.repeat} requests)")
+    common.print_table(["page", "mode", "p50 ms", "p95 ms", "mean ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+GET /catalog/search: p50/p95 sobre un catalogo de 200k variantes, por tipo de consulta.
+En Postgres usa tsvector/trigramas (BENCH_DATABASE_URL, con las migraciones 0005 aplicadas);
+en SQLite, el indice en memoria.
+Uso: python -m bench.search_latency [--products 50000] [--variants 4] [--repeat 50]
+"""
+import argparse
+import random
+
+from bench import common  # primero: configura el entorno antes de importar app
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.db import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+
+QUERIES = {
+    "text": lambda rng: {"q": rng.choice(common.COLORS)},
+    "text prefix": lambda rng: {"q": f"shirt {rng.randrange(1, 500)}"},
+    "text + category": lambda rng: {"q": "cotton", "category_id": rng.randrange(1, 11)},
+    "size + color": lambda rng: {"size": rng.choice(common.SIZES), "color": rng.choice(common.COLORS)},
+    "price + in stock": lambda rng: {"min_price": 20, "max_price": rng.randrange(30, 90), "in_stock": "true"},
+    "facets only": lambda rng: {"limit": 1},
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--variants", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    common.reset_database()
+    with SessionLocal() as db:
+        common.seed_catalog(db, products=args.products, variants_per_product=args.variants)
+
+    rng = random.Random(42)
+    rows = []
+    with TestClient(app) as client:
+        for name, make_params in QUERIES.items():
+            totals = []
+
+            def search() -> None:
+                response = client.get("/catalog/search", params=make_params(rng))
+                response.raise_for_status()
+                totals.append(response.json()["total"])
+
+            samples = common.measure(search, args.repeat, warmup=2)
+            rows.append([name, max(totals), *common.summarize_ms(samples)])
+
+    print(
+        f"GET /catalog/search ({common.engine.dialect.name}, {args.products} products, "
+        f"{args.products * args.variants} variants, {args.repeat} requests per query)"
+    )
+    common.print_table(["query", "max total", "p50 ms", "p95 ms", "mean ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
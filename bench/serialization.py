@@ -0,0 +1,78 @@
+"""
+Microbenchmark de serializacion de respuestas: el camino por defecto de FastAPI
+(validar el modelo, jsonable_encoder y JSONResponse), FastJSONResponse sobre el mismo
+jsonable_encoder, y TypeAdapter.dump_json directo sobre los objetos ORM (adapter_response).
+Uso: python -m bench.serialization [--products 200] [--sales 200] [--repeat 50]
+"""
+import argparse
+
+from bench import common  # primero: configura el entorno antes de importar app
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.core.db import SessionLocal  # noqa: E402
+from app.core.responses import FastJSONResponse, adapter_response, orjson  # noqa: E402
+from app.models import Product, ProductVariant, Sale  # noqa: E402
+from app.schemas.catalog import product_list_adapter  # noqa: E402
+from app.schemas.sale import sale_list_adapter  # noqa: E402
+
+
+def serializers(adapter) -> dict:
+    def default_path(rows) -> bytes:
+        return JSONResponse(jsonable_encoder(adapter.validate_python(rows, from_attributes=True))).body
+
+    def fast_response(rows) -> bytes:
+        return FastJSONResponse(jsonable_encoder(adapter.validate_python(rows, from_attributes=True))).body
+
+    def dump_json(rows) -> bytes:
+        return adapter_response(adapter, rows).body
+
+    return {
+        "jsonable_encoder + JSONResponse": default_path,
+        f"jsonable_encoder + FastJSONResponse ({'orjson' if orjson else 'stdlib json'})": fast_response,
+        "TypeAdapter.dump_json": dump_json,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--sales", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    common.reset_database()
+    with SessionLocal() as db:
+        lines = common.seed_catalog(db, products=args.products, variants_per_product=4, images_per_variant=8)
+        common.create_admin(db)
+        common.seed_sales(db, lines, sales=args.sales, items_per_sale=5)
+
+        payloads = {
+            f"{args.products} products x 4 variants x 8 images": (
+                product_list_adapter,
+                db.query(Product)
+                .options(selectinload(Product.variants).selectinload(ProductVariant.images))
+                .order_by(Product.id)
+                .all(),
+            ),
+            f"{args.sales} sales x 5 items": (
+                sale_list_adapter,
+                db.query(Sale).options(selectinload(Sale.items)).order_by(Sale.id.desc()).limit(args.sales).all(),
+            ),
+        }
+
+        rows = []
+        for payload_name, (adapter, objects) in payloads.items():
+            bodies = {}
+            for name, serialize in serializers(adapter).items():
+                samples = common.measure(lambda: bodies.__setitem__(name, serialize(objects)), args.repeat)
+                rows.append([payload_name, name, f"{len(bodies[name]) / 1024:.0f}", *common.summarize_ms(samples)])
+
+    print(f"Response serialization ({args.repeat} runs per path)")
+    common.print_table(["payload", "path", "KiB", "p50 ms", "p95 ms", "mean ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
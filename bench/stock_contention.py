@@ -0,0 +1,94 @@
+"""
+Flash drop: muchos compradores en paralelo sobre un mismo SKU con stock limitado.
+Verifica que no se venda de mas y muestra ventas/s y latencias de las compras exitosas.
+Con --skus N los compradores se reparten entre N productos: la unica fila compartida es la
+del dia en sales_daily, asi que mide la contencion de los agregados de ventas.
+Para medir contra Postgres: BENCH_DATABASE_URL=postgresql://... python -m bench.stock_contention
+Uso: python -m bench.stock_contention [--buyers 300] [--stock 100] [--quantity 1] [--skus 1]
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench import common  # primero: configura el entorno antes de importar app
+
+from app.core.config import settings  # noqa: E402
+from app.core.db import SessionLocal, engine  # noqa: E402
+from app.crud import sale as sale_crud  # noqa: E402
+from app.models import ProductVariant, SaleItem, SalesDaily, User  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--buyers", type=int, default=300)
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--quantity", type=int, default=1)
+    parser.add_argument("--skus", type=int, default=1)
+    args = parser.parse_args()
+    if args.buyers < 200:
+        parser.error("--buyers must be at least 200.")
+
+    common.reset_database()
+    with SessionLocal() as db:
+        lines = common.seed_catalog(db, products=args.skus, variants_per_product=1, stock=args.stock)
+        common.create_admin(db)
+        user_id = db.query(User.id).scalar()
+
+    start = threading.Barrier(args.buyers)
+    failures: list[str] = []
+
+    def buy(buyer: int) -> float | None:
+        product_id, variant_id = lines[buyer % len(lines)]
+        start.wait()
+        started = time.perf_counter()
+        with SessionLocal() as db:
+            try:
+                sale_crud.create_sale(db, user_id=user_id, items=[(product_id, args.quantity, None, variant_id)])
+            except ValueError as exc:
+                if "Insufficient stock" not in str(exc):
+                    failures.append(str(exc))
+                return None
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.buyers) as executor:
+        results = list(executor.map(buy, range(args.buyers)))
+    elapsed = time.perf_counter() - started
+    latencies = [result for result in results if result is not None]
+
+    with SessionLocal() as db:
+        final_stock = dict(db.query(ProductVariant.id, ProductVariant.stock))
+        units_sold = dict.fromkeys(final_stock, 0)
+        for variant_id, quantity in db.query(SaleItem.variant_id, SaleItem.quantity):
+            units_sold[variant_id] += quantity
+        rollup_sales = db.query(SalesDaily.sales_count).scalar() or 0
+    oversold = sum(max(0, units - args.stock) for units in units_sold.values())
+    buyers_per_sku = [len(range(n, args.buyers, len(lines))) for n in range(len(lines))]
+    expected_sales = sum(min(buyers, args.stock // args.quantity) for buyers in buyers_per_sku)
+    assert not failures, f"Unexpected errors: {failures[:3]}"
+    assert oversold == 0 and min(final_stock.values()) >= 0, f"Oversold {oversold} units: {final_stock}."
+    assert all(units_sold[v] + final_stock[v] == args.stock for v in final_stock), "Stock and sold units do not add up."
+    assert len(latencies) == expected_sales, f"Expected {expected_sales} sales, got {len(latencies)}."
+    assert rollup_sales == expected_sales, f"sales_daily counts {rollup_sales} sales, expected {expected_sales}."
+
+    print(
+        f"{args.buyers} buyers, {args.skus} SKU(s) with stock {args.stock} ({engine.dialect.name}, "
+        f"pool {settings.DB_POOL_SIZE}+{settings.DB_MAX_OVERFLOW})"
+    )
+    common.print_table(
+        ["sales", "rejected", "oversold", "sales/s", "p50 ms", "p95 ms", "mean ms"],
+        [
+            [
+                len(latencies),
+                args.buyers - len(latencies),
+                oversold,
+                f"{len(latencies) / elapsed:.1f}",
+                *common.summarize_ms(latencies),
+            ]
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
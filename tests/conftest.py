@@ -0,0 +1,103 @@
+"""
+Fixtures de los tests. Por defecto usan una base SQLite temporal; con TEST_DATABASE_URL
+corren contra otra base (por ejemplo un Postgres local), que se vacia en cada test.
+"""
+import os
+import tempfile
+
+_TEST_DIR = tempfile.mkdtemp(prefix="tienda-tests-")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{_TEST_DIR}/test.sqlite"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("PASSWORD_HASHER_EXECUTOR", "thread")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.core.cache import get_catalog_cache, principal_cache  # noqa: E402
+from app.core.db import Base, SessionLocal, engine  # noqa: E402
+from app.core.security import hash_password  # noqa: E402
+from app.crud.catalog_search import memory_search_index  # noqa: E402
+from app.crud.sku_stock import sku_stock_index  # noqa: E402
+from app.crud.user import create_user  # noqa: E402
+from app.main import app  # noqa: E402
+
+if engine.dialect.name == "sqlite":
+    # Las FK (y sus ON DELETE) se validan igual que en Postgres.
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, _):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    get_catalog_cache().clear()
+    principal_cache.clear()
+    sku_stock_index.clear()
+    memory_search_index.clear()
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def admin_headers(client, db):
+    create_user(db, username="admin", email="admin@example.com", hashed_password=hash_password("secret1"), role="admin")
+    response = client.post("/auth/login", json={"email": "admin@example.com", "password": "secret1"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def category_id(client, admin_headers):
+    response = client.post("/categories", json={"name": "Shirts", "slug": "shirts"}, headers=admin_headers)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+@pytest.fixture
+def make_product(client, admin_headers, category_id):
+    """Crea un producto con una variante y devuelve (product_id, variant_id)."""
+    counter = iter(range(1, 10_000))
+
+    def make(*, price: str = "10.50", stock: int = 5, images: int = 1) -> tuple[int, int]:
+        number = next(counter)
+        response = client.post(
+            "/catalog/products",
+            json={"name": f"Product {number}", "price": price, "category_id": category_id},
+            headers=admin_headers,
+        )
+        assert response.status_code == 201, response.text
+        product_id = response.json()["id"]
+        response = client.post(
+            f"/catalog/products/{product_id}/variants",
+            json={
+                "sku": f"SKU-{number}",
+                "size": "M",
+                "color": "red",
+                "stock": stock,
+                "images": [{"image_url": f"https://img.example.com/{number}/{position}.jpg", "position": position}
+                           for position in range(1, images + 1)],
+            },
+            headers=admin_headers,
+        )
+        assert response.status_code == 201, response.text
+        return product_id, response.json()["id"]
+
+    return make
@@ -0,0 +1,68 @@
+import pytest
+
+from app.router import catalog as catalog_router
+
+
+@pytest.fixture
+def product_list(make_product):
+    # Suficientes productos para pasar COMPRESSION_MINIMUM_SIZE.
+    for _ in range(10):
+        make_product(images=2)
+
+
+def test_each_encoding_has_its_own_etag(client, product_list):
+    identity = client.get("/catalog/products", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/catalog/products", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == identity.headers["etag"][:-1] + '-gzip"'
+    assert gzipped.json() == identity.json()
+
+
+@pytest.mark.parametrize("encoding", ["identity", "gzip"])
+def test_revalidation_returns_the_cached_representation_tag(client, product_list, encoding):
+    etag = client.get("/catalog/products", headers={"Accept-Encoding": encoding}).headers["etag"]
+
+    response = client.get("/catalog/products", headers={"Accept-Encoding": encoding, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_detail_accepts_the_encoded_etag(client, make_product):
+    product_id, _ = make_product()
+    etag = client.get(f"/catalog/products/{product_id}").headers["etag"]
+
+    response = client.get(f"/catalog/products/{product_id}", headers={"If-None-Match": etag[:-1] + '-gzip"'})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag[:-1] + '-gzip"'
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+@pytest.mark.parametrize("suffix", ["", "-gzip"])
+def test_weak_etag_revalidates(client, make_product, suffix):
+    product_id, _ = make_product()
+    etag = client.get(f"/catalog/products/{product_id}").headers["etag"]
+    weak = f'W/{etag[:-1]}{suffix}"'
+
+    response = client.get(f"/catalog/products/{product_id}", headers={"If-None-Match": f'"other", {weak}'})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == weak
+
+
+def test_cache_entry_is_stored_already_compressed(client, product_list, monkeypatch):
+    client.get("/catalog/products", headers={"Accept-Encoding": "identity"})
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache hit recompressed the body")
+
+    # Un hit no vuelve a comprimir ni modifica la entrada guardada (un cache compartido no lo veria).
+    monkeypatch.setattr(catalog_router, "compress", fail)
+    response = client.get("/catalog/products", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()
@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from app.core.db import engine
+from app.crud import catalog_import
+from app.models import Product, ProductVariant
+
+
+def records(*rows: dict):
+    return [(row_number, row, None) for row_number, row in enumerate(rows, start=1)]
+
+
+def test_import_updates_variants_before_products(db, make_product, category_id):
+    product_id, variant_id = make_product(price="10.00", stock=5)
+    statements: list[str] = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split(None, 3)[:3])
+
+    event.listen(engine, "before_cursor_execute", collect)
+    try:
+        report = catalog_import.import_catalog(
+            db,
+            records(
+                {
+                    "sku": "NEW-1",
+                    "product_name": "New",
+                    "category_id": category_id,
+                    "price": "5",
+                    "size": "S",
+                    "color": "blue",
+                },
+                {"sku": "SKU-1", "product_id": product_id, "price": "12.00", "size": "M", "color": "red", "stock": 8},
+            ),
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", collect)
+
+    assert report.errors == []
+    assert (report.rows_imported, report.products_created, report.products_updated) == (2, 1, 1)
+    # Mismo orden de bloqueo que las ventas: variantes primero, despues el producto existente.
+    variant_upsert = statements.index(["INSERT", "INTO", "product_variants"])
+    assert all(statements.index(s) > variant_upsert for s in statements if s[:2] == ["UPDATE", "products"])
+
+    db.expire_all()
+    assert db.get(ProductVariant, variant_id).stock == 8
+    assert db.get(Product, product_id).price == Decimal("12.00")
+
+
+def test_database_error_does_not_duplicate_row_errors(db, make_product, category_id, monkeypatch):
+    product_id, _ = make_product()
+
+    def fail(*args, **kwargs):
+        raise OperationalError("UPDATE products", {}, Exception("deadlock detected"))
+
+    monkeypatch.setattr(catalog_import, "bump_product_versions", fail)
+    report = catalog_import.import_catalog(
+        db,
+        records(
+            {"sku": "SKU-1", "product_id": product_id, "size": "M", "color": "red"},
+            {"sku": "X-1", "product_name": "X", "category_id": 999, "size": "M", "color": "red"},
+        ),
+    )
+
+    assert [(error.row, error.message) for error in report.errors] == [
+        (1, "Database error, batch not imported: OperationalError."),
+        (2, "Category 999 not found."),
+    ]
+    assert report.rows_imported == 0
@@ -0,0 +1,38 @@
+from sqlalchemy import event
+
+from app.core.db import engine
+from app.crud.catalog_search import SearchFilters, memory_search_index
+
+
+def search(db, q: str) -> list[int]:
+    memory_search_index.sync(db)
+    _, product_ids, _ = memory_search_index.search(q, SearchFilters(), 0, 20)
+    return product_ids
+
+
+def test_memory_index_reloads_only_when_the_watermark_changes(client, admin_headers, make_product, db):
+    product_id, _ = make_product()
+    other_id, _ = make_product()
+    assert search(db, "shirt") == []
+
+    statements: list[str] = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", collect)
+    try:
+        search(db, "shirt")
+    finally:
+        event.remove(engine, "before_cursor_execute", collect)
+    # Sin cambios, una sola consulta (la marca) y no el mapa id -> version.
+    assert len(statements) == 1 and "count(" in statements[0].lower(), statements
+
+    response = client.put(f"/catalog/products/{product_id}", json={"name": "Red shirt"}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert search(db, "shirt") == [product_id]
+
+    assert client.delete(f"/catalog/products/{product_id}", headers=admin_headers).status_code == 204
+    assert search(db, "shirt") == []
+    client.put(f"/catalog/products/{other_id}", json={"name": "Blue shirt"}, headers=admin_headers)
+    assert search(db, "blue") == [other_id]
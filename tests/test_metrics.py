@@ -0,0 +1,65 @@
+import gc
+import threading
+
+from app.core.config import settings
+from app.core.metrics import Counter, Histogram, MetricsRegistry
+from app.core.security import hash_password
+from app.crud.user import create_user
+
+
+def run_in_threads(target, count: int = 20) -> None:
+    for _ in range(count):
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+    gc.collect()
+
+
+def test_counter_folds_shards_of_finished_threads():
+    counter = Counter("test_total", "Test.", labelnames=("route",), registry=MetricsRegistry())
+
+    run_in_threads(lambda: counter.inc(route="/a"))
+    counter.inc(2, route="/a")
+
+    assert len(counter._shards) == 1
+    assert counter.render()[-1] == 'test_total{route="/a"} 22'
+
+
+def test_histogram_folds_shards_of_finished_threads():
+    histogram = Histogram("test_seconds", "Test.", buckets=(1, 5), registry=MetricsRegistry())
+
+    run_in_threads(lambda: histogram.observe(2))
+    run_in_threads(lambda: histogram.observe(0.5), count=5)
+
+    assert histogram._shards == []
+    assert histogram.render()[2:] == [
+        'test_seconds_bucket{le="1"} 5',
+        'test_seconds_bucket{le="5"} 25',
+        'test_seconds_bucket{le="+Inf"} 25',
+        "test_seconds_sum 42.5",
+        "test_seconds_count 25",
+    ]
+
+
+def test_metrics_endpoint_requires_an_admin(client, admin_headers, db):
+    assert client.get("/metrics").status_code in (401, 403)
+
+    create_user(db, username="buyer", email="buyer@example.com", hashed_password=hash_password("secret1"), role="user")
+    login = client.post("/auth/login", json={"email": "buyer@example.com", "password": "secret1"})
+    buyer_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert client.get("/metrics", headers=buyer_headers).status_code == 403
+
+    response = client.get("/metrics", headers=admin_headers)
+    assert response.status_code == 200
+    assert "http_requests_total" in response.text
+
+
+def test_metrics_endpoint_accepts_the_scrape_token(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-token"}).status_code == 200
+    response = client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+    # Con token configurado, el JWT de un admin no alcanza.
+    assert client.get("/metrics", headers=admin_headers).status_code == 401
@@ -0,0 +1,85 @@
+"""
+Cantidad de sentencias SQL por endpoint de escritura, medida por SQLStatsMiddleware
+(header Server-Timing). Si un cambio agrega una consulta, el test falla: actualizar el
+numero solo si la consulta nueva es intencional.
+"""
+import re
+
+import pytest
+
+SERVER_TIMING_QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def statement_count(response) -> int:
+    match = SERVER_TIMING_QUERIES.search(response.headers["server-timing"])
+    assert match, response.headers["server-timing"]
+    return int(match.group(1))
+
+
+@pytest.fixture
+def product(make_product):
+    # make_product ya autentico al admin: el principal queda en cache y no suma consultas.
+    return make_product(stock=10)
+
+
+def test_create_product(client, admin_headers, category_id, product):
+    response = client.post(
+        "/catalog/products",
+        json={"name": "New", "price": "30", "category_id": category_id},
+        headers=admin_headers,
+    )
+    assert response.status_code == 201
+    assert statement_count(response) == 1
+
+
+def test_update_product(client, admin_headers, product):
+    product_id, _ = product
+    response = client.put(f"/catalog/products/{product_id}", json={"price": "31.5"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert statement_count(response) == 5
+
+
+def test_create_variant(client, admin_headers, product):
+    product_id, _ = product
+    response = client.post(
+        f"/catalog/products/{product_id}/variants",
+        json={
+            "sku": "NEW-SKU",
+            "size": "L",
+            "color": "blue",
+            "stock": 3,
+            "images": [{"image_url": "https://img.example.com/a.jpg", "position": 1}],
+        },
+        headers=admin_headers,
+    )
+    assert response.status_code == 201
+    assert statement_count(response) == 5
+
+
+def test_update_variant(client, admin_headers, product):
+    _, variant_id = product
+    response = client.put(f"/catalog/variants/{variant_id}", json={"stock": 9}, headers=admin_headers)
+    assert response.status_code == 200
+    assert statement_count(response) == 4
+
+
+def test_create_image(client, admin_headers, product):
+    _, variant_id = product
+    response = client.post(
+        f"/catalog/variants/{variant_id}/images",
+        json={"image_url": "https://img.example.com/b.jpg", "position": 2},
+        headers=admin_headers,
+    )
+    assert response.status_code == 201
+    assert statement_count(response) == 5
+
+
+def test_create_sale(client, admin_headers, product):
+    product_id, variant_id = product
+    response = client.post(
+        "/sales",
+        json={"items": [{"product_id": product_id, "variant_id": variant_id, "quantity": 2}]},
+        headers=admin_headers,
+    )
+    assert response.status_code == 201
+    assert statement_count(response) == 9
@@ -0,0 +1,51 @@
+from sqlalchemy.exc import OperationalError
+
+from app.crud import analytics
+from app.models import SalesDailyCategory
+
+
+def category_rollups(db) -> dict[int, int]:
+    db.expire_all()
+    return {row.category_id: row.units for row in db.query(SalesDailyCategory)}
+
+
+def test_rollups_keep_the_category_of_the_sale(client, admin_headers, make_product, category_id, db):
+    product_id, variant_id = make_product(stock=5)
+    response = client.post(
+        "/sales",
+        json={"items": [{"product_id": product_id, "variant_id": variant_id, "quantity": 2}]},
+        headers=admin_headers,
+    )
+    assert response.status_code == 201, response.text
+    sale_id = response.json()["id"]
+
+    other = client.post("/categories", json={"name": "Pants", "slug": "pants"}, headers=admin_headers).json()["id"]
+    response = client.put(f"/catalog/products/{product_id}", json={"category_id": other}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert category_rollups(db) == {category_id: 2}
+
+    analytics.rebuild_rollups(db)
+    assert category_rollups(db) == {category_id: 2}
+
+    assert client.delete(f"/sales/{sale_id}", headers=admin_headers).status_code == 204
+    assert category_rollups(db) == {}
+
+
+def test_rollup_failure_keeps_the_sale(client, admin_headers, make_product, category_id, db, monkeypatch):
+    product_id, variant_id = make_product(stock=5)
+
+    def fail(*args, **kwargs):
+        raise OperationalError("INSERT INTO sales_daily", {}, Exception("deadlock detected"))
+
+    monkeypatch.setattr(analytics, "apply_sale_delta", fail)
+    response = client.post(
+        "/sales",
+        json={"items": [{"product_id": product_id, "variant_id": variant_id, "quantity": 2}]},
+        headers=admin_headers,
+    )
+    assert response.status_code == 201, response.text
+    assert category_rollups(db) == {}
+
+    monkeypatch.undo()
+    analytics.rebuild_rollups(db)
+    assert category_rollups(db) == {category_id: 2}
@@ -0,0 +1,171 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.cache import get_catalog_cache
+from app.core.db import SessionLocal
+from app.crud import sale as sale_crud
+from app.crud import sale_item as sale_item_crud
+from app.models import ProductVariant, SalesDaily, User
+
+
+def variant_stock(db, variant_id: int) -> int:
+    db.expire_all()
+    return db.get(ProductVariant, variant_id).stock
+
+
+def test_sale_reserves_and_delete_restores_stock(client, admin_headers, make_product, db):
+    product_id, variant_id = make_product(stock=5)
+    response = client.post(
+        "/sales",
+        json={"items": [{"product_id": product_id, "variant_id": variant_id, "quantity": 2}]},
+        headers=admin_headers,
+    )
+    assert response.status_code == 201, response.text
+    assert variant_stock(db, variant_id) == 3
+
+    assert client.delete(f"/sales/{response.json()['id']}", headers=admin_headers).status_code == 204
+    assert variant_stock(db, variant_id) == 5
+
+
+def test_delete_of_an_already_deleted_sale_does_not_restock_twice(client, admin_headers, make_product, db):
+    product_id, variant_id = make_product(stock=5)
+    sale_id = client.post(
+        "/sales",
+        json={"items": [{"product_id": product_id, "variant_id": variant_id, "quantity": 2}]},
+        headers=admin_headers,
+    ).json()["id"]
+
+    # Dos requests cargaron la misma venta; el primero la borra.
+    first, second = SessionLocal(), SessionLocal()
+    try:
+        first_sale = sale_crud.get_sale(first, sale_id)
+        second_sale = sale_crud.get_sale(second, sale_id)
+        sale_crud.delete_sale(first, first_sale)
+        with pytest.raises(ValueError):
+            sale_crud.delete_sale(second, second_sale)
+    finally:
+        first.close()
+        second.close()
+
+    assert variant_stock(db, variant_id) == 5
+
+
+def test_update_recomputes_deltas_from_the_locked_sale(client, admin_headers, make_product, db):
+    product_id, variant_id = make_product(stock=10)
+    sale_id = client.post(
+        "/sales",
+        json={"items": [{"product_id": product_id, "variant_id": variant_id, "quantity": 2}]},
+        headers=admin_headers,
+    ).json()["id"]
+
+    first, second = SessionLocal(), SessionLocal()
+    try:
+        first_sale = sale_crud.get_sale(first, sale_id)
+        second_sale = sale_crud.get_sale(second, sale_id)
+        sale_crud.update_sale(first, first_sale, items=[(product_id, 5, None, variant_id)])
+        updated = sale_crud.update_sale(second, second_sale, items=[(product_id, 3, None, variant_id)])
+        assert [item.quantity for item in updated.items] == [3]
+    finally:
+        first.close()
+        second.close()
+
+    assert variant_stock(db, variant_id) == 7
+
+
+def test_deleting_a_sold_variant_keeps_the_sale_lines(client, admin_headers, make_product, db):
+    product_id, variant_id = make_product(stock=5)
+    sale_id = client.post(
+        "/sales",
+        json={"items": [{"product_id": product_id, "variant_id": variant_id, "quantity": 1}]},
+        headers=admin_headers,
+    ).json()["id"]
+
+    assert client.delete(f"/catalog/variants/{variant_id}", headers=admin_headers).status_code == 204
+
+    sale = client.get(f"/sales/{sale_id}", headers=admin_headers).json()
+    assert [(item["product_id"], item["variant_id"]) for item in sale["items"]] == [(product_id, None)]
+
+
+def test_product_only_line_is_rejected_for_products_with_variants(client, admin_headers, make_product):
+    product_id, _ = make_product(stock=5)
+    response = client.post("/sales", json={"items": [{"product_id": product_id, "quantity": 1}]}, headers=admin_headers)
+    assert response.status_code == 400
+    assert "variant_id is required" in response.json()["detail"]
+
+
+def test_concurrent_buyers_never_oversell(client, admin_headers, make_product, db):
+    product_id, variant_id = make_product(stock=5)
+    buyers = 30
+    start = threading.Barrier(buyers)
+
+    def buy(_: int) -> bool:
+        start.wait()
+        session = SessionLocal()
+        try:
+            sale_crud.create_sale(session, user_id=1, items=[(product_id, 1, None, variant_id)])
+            return True
+        except ValueError as exc:
+            assert "Insufficient stock" in str(exc)
+            return False
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=buyers) as executor:
+        results = list(executor.map(buy, range(buyers)))
+
+    assert results.count(True) == 5
+    assert variant_stock(db, variant_id) == 0
+    db.expire_all()
+    assert sum(len(sale.items) for sale in sale_crud.list_sales(db, limit=100)) == 5
+
+
+def test_sale_item_helpers_keep_stock_total_and_rollups(db, make_product):
+    product_id, variant_id = make_product(price="10.00", stock=5)
+    other_product_id, other_variant_id = make_product(price="4.00", stock=5)
+    user_id = db.query(User.id).scalar()
+    sale = sale_crud.create_sale(db, user_id=user_id, items=[(product_id, 1, None, variant_id)])
+
+    item = sale_item_crud.create_sale_item(
+        db, sale_id=sale.id, product_id=other_product_id, quantity=2, variant_id=other_variant_id
+    )
+    item = sale_item_crud.update_sale_item(db, item, quantity=3)
+    assert variant_stock(db, other_variant_id) == 2
+    assert sale_crud.get_sale(db, sale.id).total_amount == 22
+
+    sale_item_crud.delete_sale_item(db, item)
+    assert variant_stock(db, other_variant_id) == 5
+    assert variant_stock(db, variant_id) == 4
+    daily = db.query(SalesDaily).one()
+    assert (daily.sales_count, daily.units, daily.revenue) == (1, 1, 10)
+
+    with pytest.raises(ValueError, match="at least one item"):
+        sale_item_crud.delete_sale_item(db, sale_crud.get_sale(db, sale.id).items[0])
+
+
+def test_sale_keeps_filtered_lists_cached_until_stock_crosses_zero(client, admin_headers, make_product):
+    make_product(price="10.00", stock=5)
+    other_product_id, other_variant_id = make_product(price="20.00", stock=2)
+    params = {"sort": "price", "limit": 1}
+    cache = get_catalog_cache()
+
+    def sell_one() -> None:
+        response = client.post(
+            "/sales",
+            json={"items": [{"product_id": other_product_id, "variant_id": other_variant_id, "quantity": 1}]},
+            headers=admin_headers,
+        )
+        assert response.status_code == 201, response.text
+
+    def listing_was_cached() -> bool:
+        hits = cache.hits
+        assert client.get("/catalog/products", params=params).status_code == 200
+        return cache.hits > hits
+
+    client.get("/catalog/products", params=params)
+    # El producto vendido no esta en la pagina: sin cruzar cero no la invalida.
+    sell_one()
+    assert listing_was_cached()
+    sell_one()
+    assert not listing_was_cached()